@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_item_pipeline_stage"
+down_revision = "0003_delivery_messages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("pipeline_stage", sa.String(length=16), nullable=True))
+    op.create_index("ix_items_pipeline_stage", "items", ["pipeline_stage"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_pipeline_stage", table_name="items")
+    op.drop_column("items", "pipeline_stage")
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_item_near_duplicates"
+down_revision = "0004_item_pipeline_stage"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("simhash", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "items",
+        sa.Column("cluster_id", sa.Integer(), sa.ForeignKey("items.id"), nullable=True),
+    )
+    op.create_index("ix_items_cluster_id", "items", ["cluster_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_cluster_id", table_name="items")
+    op.drop_column("items", "cluster_id")
+    op.drop_column("items", "simhash")
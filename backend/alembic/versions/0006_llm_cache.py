@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_llm_cache"
+down_revision = "0005_item_near_duplicates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache",
+        sa.Column("key", sa.String(length=64), primary_key=True),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index("ix_llm_cache_expires_at", "llm_cache", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_expires_at", table_name="llm_cache")
+    op.drop_table("llm_cache")
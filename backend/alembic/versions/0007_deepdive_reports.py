@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_deepdive_reports"
+down_revision = "0006_llm_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "deepdive_reports",
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("items.id"), primary_key=True),
+        sa.Column("report", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_deepdive_reports_created_at", "deepdive_reports", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deepdive_reports_created_at", table_name="deepdive_reports")
+    op.drop_table("deepdive_reports")
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0008_web_search_cache"
+down_revision = "0007_deepdive_reports"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "web_search_cache",
+        sa.Column("key", sa.String(length=64), primary_key=True),
+        sa.Column("query", sa.Text(), nullable=False),
+        sa.Column("results", sa.JSON(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ix_web_search_cache_expires_at", "web_search_cache", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_web_search_cache_expires_at", table_name="web_search_cache")
+    op.drop_table("web_search_cache")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0009_source_reputation"
+down_revision = "0008_web_search_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "source_reputation",
+        sa.Column("source_id", sa.Integer(), sa.ForeignKey("sources.id"), primary_key=True),
+        sa.Column("checked", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("corroborated", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("hype", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("likes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("dislikes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("source_reputation")
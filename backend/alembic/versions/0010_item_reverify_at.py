@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0010_item_reverify_at"
+down_revision = "0009_source_reputation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("reverify_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_items_reverify_at", "items", ["reverify_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_reverify_at", table_name="items")
+    op.drop_column("items", "reverify_at")
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0011_item_vector_indexed_at"
+down_revision = "0010_item_reverify_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("vector_indexed_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_items_vector_indexed_at", "items", ["vector_indexed_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_vector_indexed_at", table_name="items")
+    op.drop_column("items", "vector_indexed_at")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0012_llm_leases"
+down_revision = "0011_item_vector_indexed_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_leases",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_llm_leases_expires_at", "llm_leases", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_leases_expires_at", table_name="llm_leases")
+    op.drop_table("llm_leases")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0013_source_reputation_searched"
+down_revision = "0012_llm_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "source_reputation",
+        sa.Column("searched", sa.Float(), nullable=False, server_default="0"),
+    )
+    # Until now only searched items (and hype flags) were counted as checked.
+    op.execute("UPDATE source_reputation SET searched = checked")
+
+
+def downgrade() -> None:
+    op.drop_column("source_reputation", "searched")
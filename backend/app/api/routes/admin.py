@@ -33,6 +33,7 @@ from app.schemas import (
     OrgInviteOut,
     OrgMemberOut,
     OrgOut,
+    RelatedItemOut,
     SubscriptionCreateRequest,
     SubscriptionOut,
     SubscriptionSummaryOut,
@@ -46,6 +47,8 @@ from app.schemas import (
 )
 from app.services.corp import create_invite
 from app.services.alerts import resolve_alert as emit_resolved_alert
+from app.services.item_vectors import find_similar_items
+from app.services.topic_catalog import topic_catalog
 
 router = APIRouter(dependencies=[Depends(require_admin_session)])
 
@@ -167,6 +170,7 @@ async def create_topic(
     topic = Topic(**payload.model_dump())
     session.add(topic)
     await session.commit()
+    topic_catalog.invalidate()
     await session.refresh(topic)
     return TopicOut.model_validate(topic)
 
@@ -184,6 +188,7 @@ async def update_topic(
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(topic, field, value)
     await session.commit()
+    topic_catalog.invalidate()
     await session.refresh(topic)
     return TopicOut.model_validate(topic)
 
@@ -199,6 +204,7 @@ async def delete_topic(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Тема не найдена.")
     await session.delete(topic)
     await session.commit()
+    topic_catalog.invalidate()
     return {"message": "Тема удалена."}
 
 
@@ -237,6 +243,23 @@ async def get_item_admin(
     return ItemAdminOut(**payload, sentinel_json=item.sentinel_json, topics=topics)
 
 
+@router.get("/items/{item_id}/related", response_model=list[RelatedItemOut])
+async def get_related_items_admin(
+    item_id: int,
+    days: int = Query(default=7, ge=1, le=90),
+    limit: int = Query(default=10, ge=1, le=50),
+    session: AsyncSession = Depends(get_session),
+) -> list[RelatedItemOut]:
+    item = await session.get(Item, item_id)
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Материал не найден.")
+    related = await find_similar_items(session, item, days=days, limit=limit)
+    return [
+        RelatedItemOut(**ItemOut.model_validate(other).model_dump(), similarity=similarity)
+        for other, similarity in related
+    ]
+
+
 @router.post("/items/{item_id}/topics/lock", response_model=list[ItemTopicOut])
 async def lock_item_topics(
     item_id: int,
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Iterable
+import time
+from typing import AsyncIterator, Iterable
 
 from aiogram import Bot, Dispatcher, F, Router
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.filters import Command, CommandStart
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 from aiogram.types.message_reaction_updated import MessageReactionUpdated
@@ -15,14 +17,27 @@ from app.db.session import SessionLocal
 from app.models.delivery import DeliveryMessage
 from app.models.item import Item, ItemFeedback
 from app.models.user import User
-from app.services.ai_assistant import clarification_question, generate_bulleted_answer, generate_deepdive_report
+from app.services.ai_assistant import (
+    clarification_question,
+    is_generic_clarification,
+    stream_bulleted_answer,
+    stream_deepdive_followup,
+    stream_deepdive_report,
+)
 from app.services.ai_usage import RateLimitError, check_and_record_usage
+from app.services.deepdive import get_precomputed_report
+from app.services.item_vectors import find_similar_items
+from app.services.llm_provider import close_llm_http_client
+from app.services.metrics import process_metrics_loop
+from app.services.source_reputation import source_reputation
 
 settings = get_settings()
 router = Router()
 _pending_ask: set[int] = set()
 _pending_deepdive: dict[int, int] = {}
 _pending_pin_note: dict[int, int] = {}
+_STREAM_PLACEHOLDER = "⏳ Готовлю ответ…"
+_TELEGRAM_MESSAGE_LIMIT = 4096
 
 
 def _tma_url() -> str | None:
@@ -68,7 +83,10 @@ async def _update_feedback(
     if not feedback:
         feedback = ItemFeedback(user_id=user_id, item_id=item_id, pinned=False)
         session.add(feedback)
-    if vote is not None:
+    if vote is not None and vote != feedback.vote:
+        item = await session.get(Item, item_id)
+        if item:
+            await source_reputation.record_feedback(session, item.source_id, feedback.vote, vote)
         feedback.vote = vote
     if pinned is not None:
         feedback.pinned = pinned
@@ -185,6 +203,39 @@ async def handle_reaction(update: MessageReactionUpdated, bot: Bot) -> None:
         await session.commit()
 
 
+async def _edit_reply(reply: Message, text: str, final: bool) -> bool:
+    while True:
+        try:
+            await reply.edit_text(text)
+            return True
+        except TelegramRetryAfter as exc:
+            if not final:
+                return False
+            await asyncio.sleep(exc.retry_after)
+        except TelegramBadRequest:
+            return False
+
+
+async def _stream_reply(message: Message, chunks: AsyncIterator[str]) -> None:
+    reply = await message.answer(_STREAM_PLACEHOLDER)
+    shown = _STREAM_PLACEHOLDER
+    pending: str | None = None
+    edited_at = time.monotonic()
+    async for text in chunks:
+        pending = text[:_TELEGRAM_MESSAGE_LIMIT]
+        if pending.strip() and time.monotonic() - edited_at >= settings.bot_stream_edit_interval_seconds:
+            if pending != shown and await _edit_reply(reply, pending, final=False):
+                shown = pending
+            edited_at = time.monotonic()
+    if pending is None:
+        try:
+            await reply.delete()
+        except TelegramBadRequest:
+            pass
+    elif pending != shown:
+        await _edit_reply(reply, pending, final=True)
+
+
 async def _handle_ask(message: Message, prompt: str) -> None:
     async with SessionLocal() as session:
         user = await _get_or_create_user(session, message.from_user.id, message.from_user.username)
@@ -195,8 +246,7 @@ async def _handle_ask(message: Message, prompt: str) -> None:
             await session.rollback()
             await message.answer(exc.message)
             return
-    answer = await generate_bulleted_answer(prompt)
-    await message.answer(answer)
+    await _stream_reply(message, stream_bulleted_answer(prompt))
 
 
 async def _handle_deepdive(message: Message, item_id: int, clarification: str) -> None:
@@ -213,8 +263,16 @@ async def _handle_deepdive(message: Message, item_id: int, clarification: str) -
             await session.rollback()
             await message.answer(exc.message)
             return
-    report = await generate_deepdive_report(item, clarification)
-    await message.answer(report)
+        report = await get_precomputed_report(session, item_id)
+        related = [] if report else await find_similar_items(session, item)
+    if report:
+        await message.answer(report)
+        if not is_generic_clarification(clarification):
+            await _stream_reply(message, stream_deepdive_followup(item, report, clarification))
+        return
+    await _stream_reply(
+        message, stream_deepdive_report(item, clarification, [other for other, _ in related])
+    )
 
 
 async def _ensure_delivery_context() -> None:
@@ -229,7 +287,14 @@ async def run_bot() -> None:
     bot = Bot(token=settings.bot_token)
     dp = Dispatcher()
     dp.include_router(router)
-    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    stop_event = asyncio.Event()
+    metrics_task = asyncio.create_task(process_metrics_loop(stop_event, "bot"))
+    try:
+        await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    finally:
+        stop_event.set()
+        await metrics_task
+        await close_llm_http_client()
 
 
 def main() -> None:
@@ -18,6 +18,8 @@ class Settings(BaseSettings):
         default="postgresql+asyncpg://infra:infra@db:5432/infra",
         alias="DATABASE_URL",
     )
+    db_pool_size: int = Field(default=10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
     bot_token: str = Field(default="", alias="BOT_TOKEN")
     admin_ids: Any = Field(default="", alias="ADMIN_IDS")
     admin_panel_username: str = Field(default="admin", alias="ADMIN_PANEL_USERNAME")
@@ -36,7 +38,26 @@ class Settings(BaseSettings):
     litellm_model: str | None = Field(default=None, alias="LITELLM_MODEL")
     litellm_api_key: str | None = Field(default=None, alias="LITELLM_API_KEY")
     litellm_timeout_seconds: int = Field(default=20, alias="LITELLM_TIMEOUT_SECONDS")
+    litellm_max_connections: int = Field(default=20, alias="LITELLM_MAX_CONNECTIONS")
+    litellm_keepalive_seconds: int = Field(default=60, alias="LITELLM_KEEPALIVE_SECONDS")
+    litellm_http2: bool = Field(default=False, alias="LITELLM_HTTP2")
+    llm_max_concurrency: int = Field(default=8, alias="LLM_MAX_CONCURRENCY")
+    llm_background_concurrency: int = Field(default=4, alias="LLM_BACKGROUND_CONCURRENCY")
+    llm_governor_shared: bool = Field(default=True, alias="LLM_GOVERNOR_SHARED")
+    llm_governor_poll_ms: int = Field(default=200, alias="LLM_GOVERNOR_POLL_MS")
+    llm_governor_lease_seconds: int = Field(default=300, alias="LLM_GOVERNOR_LEASE_SECONDS")
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_ttl_seconds: int = Field(default=6 * 3600, alias="LLM_CACHE_TTL_SECONDS")
+    llm_cache_max_entries: int = Field(default=1000, alias="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_persistent: bool = Field(default=False, alias="LLM_CACHE_PERSISTENT")
+    bot_stream_edit_interval_seconds: float = Field(
+        default=1.5, alias="BOT_STREAM_EDIT_INTERVAL_SECONDS"
+    )
     chroma_url: str | None = Field(default=None, alias="CHROMA_URL")
+    embedding_model: str = Field(
+        default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        alias="EMBEDDING_MODEL",
+    )
     global_rate_limit_per_minute: int = Field(default=30, alias="GLOBAL_RATE_LIMIT_PER_MIN")
     public_rate_limit_per_minute: int = Field(default=60, alias="PUBLIC_RATE_LIMIT_PER_MIN")
     public_rate_limit_window_seconds: int = Field(default=60, alias="PUBLIC_RATE_LIMIT_WINDOW_SECONDS")
@@ -45,11 +66,63 @@ class Settings(BaseSettings):
     web_search_cache_minutes_min: int = Field(default=5, alias="WEB_SEARCH_CACHE_MIN")
     web_search_cache_minutes_max: int = Field(default=30, alias="WEB_SEARCH_CACHE_MAX")
     web_search_cache_max_entries: int = Field(default=500, alias="WEB_SEARCH_CACHE_MAX_ENTRIES")
+    web_search_cache_persistent: bool = Field(default=True, alias="WEB_SEARCH_CACHE_PERSISTENT")
+    sentinel_batch_size: int = Field(default=32, alias="SENTINEL_BATCH_SIZE")
+    sentinel_batch_window_ms: int = Field(default=20, alias="SENTINEL_BATCH_WINDOW_MS")
+    sentinel_process_threshold_chars: int = Field(
+        default=20_000, alias="SENTINEL_PROCESS_THRESHOLD_CHARS"
+    )
+    sentinel_reverify_interval_seconds: int = Field(
+        default=60, alias="SENTINEL_REVERIFY_INTERVAL_SECONDS"
+    )
+    sentinel_reverify_batch_size: int = Field(default=20, alias="SENTINEL_REVERIFY_BATCH_SIZE")
+    sentinel_reverify_delay_seconds: int = Field(default=300, alias="SENTINEL_REVERIFY_DELAY_SECONDS")
+    sentinel_reverify_max_attempts: int = Field(default=5, alias="SENTINEL_REVERIFY_MAX_ATTEMPTS")
+    source_reputation_half_life_days: int = Field(default=30, alias="SOURCE_REPUTATION_HALF_LIFE_DAYS")
+    source_reputation_cache_seconds: int = Field(default=60, alias="SOURCE_REPUTATION_CACHE_SECONDS")
+    source_trusted_score: int = Field(default=85, alias="SOURCE_TRUSTED_SCORE")
+    source_trusted_min_checks: int = Field(default=20, alias="SOURCE_TRUSTED_MIN_CHECKS")
+    cross_check_query_similarity: float = Field(default=0.8, alias="CROSS_CHECK_QUERY_SIMILARITY")
+    cross_check_max_wait_seconds: int = Field(default=30, alias="CROSS_CHECK_MAX_WAIT_SECONDS")
     ingestion_interval_seconds: int = Field(default=60, alias="INGESTION_INTERVAL_SECONDS")
     ingestion_request_timeout_seconds: int = Field(
         default=15, alias="INGESTION_REQUEST_TIMEOUT_SECONDS"
     )
     ingestion_request_retries: int = Field(default=2, alias="INGESTION_REQUEST_RETRIES")
+    feed_fetch_max_bytes: int = Field(default=5 * 1024 * 1024, alias="FEED_FETCH_MAX_BYTES")
+    feed_fetch_max_connections: int = Field(default=50, alias="FEED_FETCH_MAX_CONNECTIONS")
+    feed_fetch_per_host_concurrency: int = Field(default=2, alias="FEED_FETCH_PER_HOST_CONCURRENCY")
+    feed_parse_process_threshold_bytes: int = Field(
+        default=1024 * 1024, alias="FEED_PARSE_PROCESS_THRESHOLD_BYTES"
+    )
+    cpu_pool_workers: int = Field(default=2, alias="CPU_POOL_WORKERS")
+    ingestion_min_interval_seconds: int = Field(default=15, alias="INGESTION_MIN_INTERVAL_SECONDS")
+    ingestion_max_interval_seconds: int = Field(default=3600, alias="INGESTION_MAX_INTERVAL_SECONDS")
+    ingestion_max_workers: int = Field(default=16, alias="INGESTION_MAX_WORKERS")
+    ingestion_rss_concurrency: int = Field(default=8, alias="INGESTION_RSS_CONCURRENCY")
+    ingestion_telegram_concurrency: int = Field(default=2, alias="INGESTION_TELEGRAM_CONCURRENCY")
+    ingestion_reddit_concurrency: int = Field(default=4, alias="INGESTION_REDDIT_CONCURRENCY")
+    near_duplicate_max_distance: int = Field(default=5, alias="NEAR_DUPLICATE_MAX_DISTANCE")
+    near_duplicate_index_size: int = Field(default=20000, alias="NEAR_DUPLICATE_INDEX_SIZE")
+    near_duplicate_window_hours: int = Field(default=12, alias="NEAR_DUPLICATE_WINDOW_HOURS")
+    pipeline_queue_size: int = Field(default=100, alias="PIPELINE_QUEUE_SIZE")
+    pipeline_poll_seconds: float = Field(default=2, alias="PIPELINE_POLL_SECONDS")
+    pipeline_tag_workers: int = Field(default=16, alias="PIPELINE_TAG_WORKERS")
+    pipeline_verify_workers: int = Field(default=8, alias="PIPELINE_VERIFY_WORKERS")
+    pipeline_deliver_workers: int = Field(default=2, alias="PIPELINE_DELIVER_WORKERS")
+    pipeline_deepdive_workers: int = Field(default=1, alias="PIPELINE_DEEPDIVE_WORKERS")
+    deepdive_precompute_enabled: bool = Field(default=False, alias="DEEPDIVE_PRECOMPUTE_ENABLED")
+    deepdive_precompute_daily_budget: int = Field(
+        default=50, alias="DEEPDIVE_PRECOMPUTE_DAILY_BUDGET"
+    )
+    topic_llm_batch_size: int = Field(default=10, alias="TOPIC_LLM_BATCH_SIZE")
+    topic_llm_batch_window_ms: int = Field(default=500, alias="TOPIC_LLM_BATCH_WINDOW_MS")
+    topic_catalog_check_seconds: int = Field(default=30, alias="TOPIC_CATALOG_CHECK_SECONDS")
+    topic_vector_enabled: bool = Field(default=False, alias="TOPIC_VECTOR_ENABLED")
+    topic_vector_min_similarity: float = Field(default=0.5, alias="TOPIC_VECTOR_MIN_SIMILARITY")
+    item_vector_enabled: bool = Field(default=False, alias="ITEM_VECTOR_ENABLED")
+    item_vector_batch_size: int = Field(default=64, alias="ITEM_VECTOR_BATCH_SIZE")
+    item_vector_flush_seconds: int = Field(default=5, alias="ITEM_VECTOR_FLUSH_SECONDS")
     telethon_api_id: int | None = Field(default=None, alias="TELETHON_API_ID")
     telethon_api_hash: str = Field(default="", alias="TELETHON_API_HASH")
     telethon_session: str = Field(default="", alias="TELETHON_SESSION")
@@ -92,6 +165,8 @@ def _is_bcrypt_hash(value: str) -> bool:
 
 
 def validate_settings(settings: Settings) -> None:
+    if settings.ingestion_max_workers > settings.db_pool_size + settings.db_max_overflow:
+        raise ValueError("INGESTION_MAX_WORKERS больше пула соединений DB_POOL_SIZE + DB_MAX_OVERFLOW.")
     if not _is_prod(settings):
         return
     if settings.admin_panel_password:
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from app.core.config import get_settings
+
+settings = get_settings()
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Forking a process that runs threads (to_thread, Chroma, torch) can deadlock the child.
+        _executor = ProcessPoolExecutor(
+            max_workers=max(1, settings.cpu_pool_workers),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _executor
+
+
+async def run_in_process_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+
+
+def shutdown_process_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
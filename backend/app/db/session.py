@@ -6,10 +6,21 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, future=True, pool_pre_ping=True)
+_pool_options = (
+    {}
+    if settings.database_url.startswith("sqlite")
+    else {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+)
+engine = create_async_engine(settings.database_url, future=True, pool_pre_ping=True, **_pool_options)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
+async def release_connection(session: AsyncSession) -> None:
+    # Ends the current transaction so the pooled connection is free during a slow external
+    # call; loaded objects stay usable because sessions do not expire on commit.
+    await session.commit()
+
+
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
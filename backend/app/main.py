@@ -8,9 +8,15 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import admin, admin_auth, health, public
 from app.core.config import get_settings, validate_settings
+from app.core.process_pool import shutdown_process_pool
 from app.services.delivery import delivery_loop
-from app.services.ingestion import ingestion_loop
+from app.services.feed_fetcher import feed_fetcher
+from app.services.ingestion_scheduler import ingestion_loop
+from app.services.item_vectors import item_vector_loop
+from app.services.llm_provider import close_llm_http_client
 from app.services.metrics import metrics_loop
+from app.services.pipeline import pipeline_loop
+from app.services.reverify import reverify_loop
 
 
 @asynccontextmanager
@@ -18,10 +24,23 @@ async def lifespan(_: FastAPI):
     stop_event = asyncio.Event()
     metrics_task = asyncio.create_task(metrics_loop(stop_event))
     ingestion_task = asyncio.create_task(ingestion_loop(stop_event))
+    pipeline_task = asyncio.create_task(pipeline_loop(stop_event))
     delivery_task = asyncio.create_task(delivery_loop(stop_event))
+    item_vector_task = asyncio.create_task(item_vector_loop(stop_event))
+    reverify_task = asyncio.create_task(reverify_loop(stop_event))
     yield
     stop_event.set()
-    await asyncio.gather(metrics_task, ingestion_task, delivery_task)
+    await asyncio.gather(
+        metrics_task,
+        ingestion_task,
+        pipeline_task,
+        delivery_task,
+        item_vector_task,
+        reverify_task,
+    )
+    await feed_fetcher.aclose()
+    await close_llm_http_client()
+    shutdown_process_pool()
 
 
 app = FastAPI(title="INFRA", lifespan=lifespan)
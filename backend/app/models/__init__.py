@@ -1,28 +1,38 @@
 from app.models.ai_usage import AiUsage
 from app.models.alert import Alert
+from app.models.deepdive import DeepDiveReport
 from app.models.delivery import DeliveryMessage
 from app.models.item import Item, ItemFeedback, ItemTopic
+from app.models.llm_cache import LlmCacheEntry
+from app.models.llm_lease import LlmLease
 from app.models.metric import Metric
 from app.models.org import Org, OrgInvite, OrgMember
 from app.models.source import Source
+from app.models.source_reputation import SourceReputation
 from app.models.subscription import Subscription
 from app.models.topic import Topic
 from app.models.user import User, user_topics
+from app.models.web_search_cache import WebSearchCacheEntry
 
 __all__ = [
     "AiUsage",
     "Alert",
+    "DeepDiveReport",
     "DeliveryMessage",
     "Item",
     "ItemFeedback",
     "ItemTopic",
+    "LlmCacheEntry",
+    "LlmLease",
     "Metric",
     "Org",
     "OrgInvite",
     "OrgMember",
     "Source",
+    "SourceReputation",
     "Subscription",
     "Topic",
     "User",
     "user_topics",
+    "WebSearchCacheEntry",
 ]
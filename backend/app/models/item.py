@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, JSON, String, Text, func
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Integer, JSON, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -25,6 +25,15 @@ class Item(Base):
     trust_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     trust_status: Mapped[str | None] = mapped_column(String(16), nullable=True)
     sentinel_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    simhash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    cluster_id: Mapped[int | None] = mapped_column(ForeignKey("items.id"), nullable=True, index=True)
+    pipeline_stage: Mapped[str | None] = mapped_column(String(16), nullable=True, index=True)
+    reverify_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    vector_indexed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SourceReputation(Base):
+    __tablename__ = "source_reputation"
+
+    source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"), primary_key=True)
+    checked: Mapped[float] = mapped_column(Float, default=0.0)
+    searched: Mapped[float] = mapped_column(Float, default=0.0)
+    corroborated: Mapped[float] = mapped_column(Float, default=0.0)
+    hype: Mapped[float] = mapped_column(Float, default=0.0)
+    likes: Mapped[float] = mapped_column(Float, default=0.0)
+    dislikes: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -8,7 +8,13 @@ from app.schemas.financials import (
     SubscriptionSummaryOut,
     SubscriptionSummaryTierOut,
 )
-from app.schemas.item import ItemAdminOut, ItemOut, ItemTopicLockRequest, ItemTopicOut
+from app.schemas.item import (
+    ItemAdminOut,
+    ItemOut,
+    ItemTopicLockRequest,
+    ItemTopicOut,
+    RelatedItemOut,
+)
 from app.schemas.metric import MetricOut
 from app.schemas.org import (
     CorpInviteAcceptRequest,
@@ -47,6 +53,7 @@ __all__ = [
     "ItemAdminOut",
     "ItemTopicOut",
     "ItemTopicLockRequest",
+    "RelatedItemOut",
     "MetricOut",
     "CorpInviteAcceptRequest",
     "OrgCreate",
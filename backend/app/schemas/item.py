@@ -21,6 +21,7 @@ class ItemOut(BaseModel):
     impact: str | None = None
     trust_score: int | None = None
     trust_status: str | None = None
+    cluster_id: int | None = None
     created_at: datetime
 
 
@@ -39,5 +40,9 @@ class ItemAdminOut(ItemOut):
     topics: list[ItemTopicOut] = []
 
 
+class RelatedItemOut(ItemOut):
+    similarity: float
+
+
 class ItemTopicLockRequest(BaseModel):
     topic_ids: list[int] | None = None
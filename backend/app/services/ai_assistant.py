@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import re
+from typing import AsyncIterator
 
 from app.models.item import Item
 from app.services.llm_provider import LlmProviderError, get_llm_provider
@@ -52,42 +53,136 @@ def _ensure_report_length(text: str, filler: str) -> str:
     return cleaned
 
 
+_QA_FALLBACK = "Ответ будет доступен позже."
+_GENERIC_CLARIFICATIONS = {"", "-", "/skip", "skip", "нет", "все", "всё", "в целом", "общий обзор"}
+
+
+def _qa_messages(prompt: str) -> list[dict[str, str]]:
+    system = "Ты аналитик. Отвечай на русском, только списком 2-6 буллетов."
+    user_prompt = f"Вопрос: {prompt}\nОтветь 2-6 буллетами, без лишнего текста."
+    return [{"role": "system", "content": system}, {"role": "user", "content": user_prompt}]
+
+
 async def generate_bulleted_answer(prompt: str) -> str:
     provider = get_llm_provider()
     if not provider:
-        return _format_bullets("Ответ будет доступен позже.")
-    system = "Ты аналитик. Отвечай на русском, только списком 2-6 буллетов."
-    user_prompt = f"Вопрос: {prompt}\nОтветь 2-6 буллетами, без лишнего текста."
+        return _format_bullets(_QA_FALLBACK)
     try:
-        response = await provider.chat(
-            [{"role": "system", "content": system}, {"role": "user", "content": user_prompt}]
-        )
+        response = await provider.chat(_qa_messages(prompt))
     except LlmProviderError:
         logger.exception("LLM error while generating QA answer")
-        return _format_bullets("Ответ будет доступен позже.")
+        return _format_bullets(_QA_FALLBACK)
     return _format_bullets(response)
 
 
-async def generate_deepdive_report(item: Item, clarification: str) -> str:
+async def stream_bulleted_answer(prompt: str) -> AsyncIterator[str]:
     provider = get_llm_provider()
     if not provider:
-        fallback = f"Материал: {item.title}\n\n{item.text}"
-        return _ensure_report_length(fallback, item.text or item.title)
+        yield _format_bullets(_QA_FALLBACK)
+        return
+    response = ""
+    try:
+        async for chunk in provider.chat_stream(_qa_messages(prompt)):
+            response += chunk
+            yield response
+    except LlmProviderError:
+        logger.exception("LLM error while streaming QA answer")
+        if not response:
+            yield _format_bullets(_QA_FALLBACK)
+            return
+    yield _format_bullets(response)
+
+
+def _related_context(related: list[Item]) -> str:
+    lines: list[str] = []
+    for other in related:
+        if other.published_at:
+            lines.append(f"- {other.title} ({other.published_at.date().isoformat()})")
+        else:
+            lines.append(f"- {other.title}")
+    return "\n".join(lines)
+
+
+def _deepdive_messages(
+    item: Item, clarification: str, related: list[Item] | None
+) -> list[dict[str, str]]:
     prompt = (
         "Составь структурированный отчёт на русском (1500–2500 символов). "
         "Структура: 1) Резюме 2) Ключевые факты 3) Риски и последствия "
         "4) Что наблюдать дальше. Используй связный текст и подзаголовки."
     )
-    item_text = item.text or ""
-    user_content = (
-        f"{prompt}\n\nНовость: {item.title}\n{item_text}\n\n"
-        f"Уточнение пользователя: {clarification}"
+    user_content = f"{prompt}\n\nНовость: {item.title}\n{item.text or ''}"
+    if clarification:
+        user_content += f"\n\nУточнение пользователя: {clarification}"
+    if related:
+        user_content += f"\n\nСвязанные материалы за последние дни:\n{_related_context(related)}"
+    return [{"role": "system", "content": "Ты опытный аналитик."}, {"role": "user", "content": user_content}]
+
+
+def _deepdive_fallback(item: Item) -> str:
+    return f"Материал: {item.title}\n\n{item.text or ''}"
+
+
+async def stream_deepdive_report(
+    item: Item, clarification: str, related: list[Item] | None = None
+) -> AsyncIterator[str]:
+    provider = get_llm_provider()
+    if not provider:
+        yield _ensure_report_length(_deepdive_fallback(item), item.text or item.title)
+        return
+    response = ""
+    try:
+        async for chunk in provider.chat_stream(_deepdive_messages(item, clarification, related)):
+            response += chunk
+            yield response
+    except LlmProviderError:
+        logger.exception("LLM error while streaming deepdive")
+        if not response:
+            response = _deepdive_fallback(item)
+    yield _ensure_report_length(response, item.text or item.title)
+
+
+async def generate_base_deepdive_report(
+    item: Item, related: list[Item] | None = None
+) -> str | None:
+    provider = get_llm_provider()
+    if not provider:
+        return None
+    try:
+        response = await provider.chat(_deepdive_messages(item, "", related))
+    except LlmProviderError:
+        logger.exception("LLM error while precomputing deepdive")
+        return None
+    return _ensure_report_length(response, item.text or item.title)
+
+
+def is_generic_clarification(clarification: str) -> bool:
+    normalized = " ".join(clarification.lower().split()).strip(" .!")
+    return normalized in _GENERIC_CLARIFICATIONS
+
+
+def _followup_messages(item: Item, report: str, clarification: str) -> list[dict[str, str]]:
+    user_prompt = (
+        f"Новость: {item.title}\n\nГотовый отчёт:\n{report}\n\n"
+        f"Уточнение пользователя: {clarification}\n"
+        "Ответь на уточнение 2-6 буллетами, опираясь на отчёт и не повторяя его."
     )
+    return [{"role": "system", "content": "Ты опытный аналитик."}, {"role": "user", "content": user_prompt}]
+
+
+async def stream_deepdive_followup(
+    item: Item, report: str, clarification: str
+) -> AsyncIterator[str]:
+    provider = get_llm_provider()
+    if not provider:
+        return
+    response = ""
     try:
-        response = await provider.chat(
-            [{"role": "system", "content": "Ты опытный аналитик."}, {"role": "user", "content": user_content}]
-        )
+        async for chunk in provider.chat_stream(_followup_messages(item, report, clarification)):
+            response += chunk
+            yield response
     except LlmProviderError:
-        logger.exception("LLM error while generating deepdive")
-        response = f"Материал: {item.title}\n\n{item_text}"
-    return _ensure_report_length(response, item_text or item.title)
+        logger.exception("LLM error while streaming deepdive follow-up")
+        if not response:
+            return
+    yield _format_bullets(response)
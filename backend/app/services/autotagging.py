@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import re
-from typing import Iterable
+from dataclasses import dataclass
 
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.db.session import release_connection
 from app.models.item import Item, ItemTopic
-from app.models.topic import Topic
-from app.services.llm_provider import LlmProviderError, get_llm_provider
+from app.services.llm_provider import get_llm_provider
+from app.services.topic_catalog import CatalogTopic, TopicSnapshot, topic_catalog
+from app.services.topic_vectors import topic_vector_index
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 _MAX_TOPICS = 3
 _MAX_LLM_TEXT_LENGTH = 1200
@@ -23,21 +27,7 @@ def _normalize_text(value: str) -> str:
     return " ".join(value.lower().split())
 
 
-def _score_topic(text: str, keywords: Iterable[str] | None) -> float:
-    if not keywords:
-        return 0.0
-    score = 0.0
-    for keyword in keywords:
-        cleaned = keyword.strip().lower()
-        if not cleaned:
-            continue
-        pattern = re.escape(cleaned)
-        matches = re.findall(pattern, text)
-        score += len(matches)
-    return score
-
-
-def _is_clear_leader(scored: list[tuple[Topic, float]]) -> bool:
+def _is_clear_leader(scored: list[tuple[CatalogTopic, float]]) -> bool:
     if not scored:
         return False
     if len(scored) == 1:
@@ -47,39 +37,9 @@ def _is_clear_leader(scored: list[tuple[Topic, float]]) -> bool:
     return top_score >= second_score + 1
 
 
-async def _pick_topics_with_llm(
-    topics: list[Topic], title: str, text: str
+def _topic_ids_from_response(
+    parsed: object, limited_topics: tuple[CatalogTopic, ...]
 ) -> list[int]:
-    provider = get_llm_provider()
-    if not provider:
-        return []
-    summary = f"{title}\n\n{text[:_MAX_LLM_TEXT_LENGTH]}"
-    limited_topics = topics[:_MAX_LLM_TOPICS]
-    topic_catalog = [
-        {"id": topic.id, "name": topic.name, "description": topic.description or ""}
-        for topic in limited_topics
-    ]
-    prompt_ru = (
-        "Выбери 1-3 темы, которые лучше всего подходят к материалу. "
-        "Ответь JSON-массивом идентификаторов тем, например: [1,2]."
-    )
-    try:
-        response = await provider.chat(
-            [
-                {"role": "system", "content": "Ты помощник, который выбирает темы."},
-                {
-                    "role": "user",
-                    "content": f"{prompt_ru}\n\nТемы: {json.dumps(topic_catalog)}\n\nТекст: {summary}",
-                },
-            ]
-        )
-    except LlmProviderError:
-        logger.exception("LLM error while picking topics")
-        return []
-    try:
-        parsed = json.loads(response)
-    except json.JSONDecodeError:
-        return []
     if isinstance(parsed, dict):
         for key in _LLM_TOPIC_KEYS:
             if key in parsed:
@@ -105,14 +65,148 @@ async def _pick_topics_with_llm(
     return selected
 
 
+def _batch_results(parsed: object, size: int) -> dict[int, object]:
+    if isinstance(parsed, dict) and isinstance(parsed.get("items"), list):
+        parsed = parsed["items"]
+    results: dict[int, object] = {}
+    if isinstance(parsed, dict):
+        for key, value in parsed.items():
+            try:
+                results[int(key)] = value
+            except (TypeError, ValueError):
+                continue
+    elif isinstance(parsed, list):
+        for entry in parsed:
+            if isinstance(entry, dict) and "id" in entry:
+                try:
+                    results[int(entry["id"])] = entry
+                except (TypeError, ValueError):
+                    continue
+        if not results and size == 1:
+            results[1] = parsed
+    return results
+
+
+@dataclass
+class _PendingClassification:
+    title: str
+    text: str
+    future: asyncio.Future[list[int]]
+
+
+class TopicBatchClassifier:
+    def __init__(self) -> None:
+        self._pending: list[_PendingClassification] = []
+        self._topics: tuple[CatalogTopic, ...] = ()
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def classify(
+        self, topics: tuple[CatalogTopic, ...], title: str, text: str
+    ) -> list[int]:
+        if not get_llm_provider():
+            return []
+        if self._pending and topics != self._topics:
+            self._flush()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[int]] = loop.create_future()
+        self._topics = topics
+        self._pending.append(_PendingClassification(title, text, future))
+        if len(self._pending) >= max(1, settings.topic_llm_batch_size):
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                settings.topic_llm_batch_window_ms / 1000, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._classify_batch(self._topics, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _classify_batch(
+        self, topics: tuple[CatalogTopic, ...], batch: list[_PendingClassification]
+    ) -> None:
+        results: dict[int, list[int]] = {}
+        try:
+            results = await self._request(topics, batch)
+        except Exception:
+            logger.exception("LLM error while picking topics")
+        for index, pending in enumerate(batch, start=1):
+            if not pending.future.done():
+                pending.future.set_result(results.get(index, []))
+
+    async def _request(
+        self, topics: tuple[CatalogTopic, ...], batch: list[_PendingClassification]
+    ) -> dict[int, list[int]]:
+        provider = get_llm_provider()
+        if not provider:
+            return {}
+        limited_topics = topics[:_MAX_LLM_TOPICS]
+        topic_catalog_json = [
+            {"id": topic.id, "name": topic.name, "description": topic.description or ""}
+            for topic in limited_topics
+        ]
+        materials = [
+            {"id": index, "text": f"{pending.title}\n\n{pending.text[:_MAX_LLM_TEXT_LENGTH]}"}
+            for index, pending in enumerate(batch, start=1)
+        ]
+        prompt_ru = (
+            "Для каждого материала выбери 1-3 темы, которые лучше всего ему подходят. "
+            "Ответь JSON-объектом, где ключ — id материала, а значение — массив "
+            'идентификаторов тем, например: {"1": [1,2], "2": [3]}.'
+        )
+        response = await provider.chat(
+            [
+                {"role": "system", "content": "Ты помощник, который выбирает темы."},
+                {
+                    "role": "user",
+                    "content": (
+                        f"{prompt_ru}\n\nТемы: {json.dumps(topic_catalog_json)}"
+                        f"\n\nМатериалы: {json.dumps(materials, ensure_ascii=False)}"
+                    ),
+                },
+            ]
+        )
+        try:
+            parsed = json.loads(response)
+        except json.JSONDecodeError:
+            return {}
+        return {
+            index: _topic_ids_from_response(value, limited_topics)
+            for index, value in _batch_results(parsed, len(batch)).items()
+        }
+
+
+topic_batch_classifier = TopicBatchClassifier()
+
+
+async def _pick_topics_with_vectors(catalog: TopicSnapshot, item: Item) -> dict[int, float]:
+    if not settings.topic_vector_enabled:
+        return {}
+    try:
+        matches = await topic_vector_index.match(
+            catalog, item.title, item.text or "", _MAX_TOPICS
+        )
+    except Exception:
+        logger.exception("Vector topic lookup failed")
+        return {}
+    return dict(matches)
+
+
 async def assign_topics(session: AsyncSession, item: Item) -> list[ItemTopic]:
     if item.id is None:
         await session.flush()
 
-    result = await session.execute(
-        select(Topic).order_by(Topic.order.is_(None), Topic.order, Topic.id)
-    )
-    topics = result.scalars().all()
+    catalog = await topic_catalog.get(session)
+    topics = catalog.topics
     if not topics:
         return []
 
@@ -121,21 +215,28 @@ async def assign_topics(session: AsyncSession, item: Item) -> list[ItemTopic]:
     ).scalars().all()
     locked_ids = {row.topic_id for row in existing if row.locked}
 
-    scored: list[tuple[Topic, float]] = []
+    scored: list[tuple[CatalogTopic, float]] = []
     text = _normalize_text(f"{item.title} {item.text}")
+    topic_scores = catalog.matcher.scores(text)
     for topic in topics:
-        score = _score_topic(text, topic.keywords)
+        score = topic_scores.get(topic.id, 0.0)
         if score > 0:
             scored.append((topic, score))
     scored.sort(key=lambda pair: pair[1], reverse=True)
 
     selected_topic_ids: list[int] = []
+    vector_scores: dict[int, float] = {}
     if scored and _is_clear_leader(scored):
         selected_topic_ids = [topic.id for topic, _ in scored[:_MAX_TOPICS]]
     else:
-        selected_topic_ids = await _pick_topics_with_llm(
-            topics, item.title, item.text or ""
-        )
+        # Ambiguous items wait for the batched LLM call; do not pin a pooled connection meanwhile.
+        await release_connection(session)
+        vector_scores = await _pick_topics_with_vectors(catalog, item)
+        selected_topic_ids = list(vector_scores)
+        if not selected_topic_ids:
+            selected_topic_ids = await topic_batch_classifier.classify(
+                topics, item.title, item.text or ""
+            )
 
     if not selected_topic_ids and scored:
         selected_topic_ids = [topic.id for topic, _ in scored[:_MAX_TOPICS]]
@@ -144,6 +245,7 @@ async def assign_topics(session: AsyncSession, item: Item) -> list[ItemTopic]:
         return []
 
     selected_scores = {topic.id: score for topic, score in scored}
+    selected_scores.update(vector_scores)
 
     # Overwrite only unlocked auto-assignments while preserving locked topics.
     await session.execute(
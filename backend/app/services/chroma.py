@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import chromadb
+import re
+from functools import lru_cache
 from urllib.parse import urlparse
 
+import chromadb
+
 from app.core.config import get_settings
 
 settings = get_settings()
+_shared_client: chromadb.ClientAPI | None = None
+_COLLECTION_NAME_RE = re.compile(r"[^a-zA-Z0-9_-]+")
 
 
 def get_chroma_client() -> chromadb.ClientAPI:
@@ -15,3 +20,36 @@ def get_chroma_client() -> chromadb.ClientAPI:
         port = parsed.port or 8000
         return chromadb.HttpClient(host=host, port=port)
     return chromadb.Client()
+
+
+def get_shared_chroma_client() -> chromadb.ClientAPI:
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = get_chroma_client()
+    return _shared_client
+
+
+@lru_cache
+def get_embedding_function() -> object:
+    from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+    return SentenceTransformerEmbeddingFunction(model_name=settings.embedding_model)
+
+
+def _collection_name(name: str) -> str:
+    # Vectors from different models are not comparable, so each model gets its own collection.
+    model = _COLLECTION_NAME_RE.sub("-", settings.embedding_model.rsplit("/", 1)[-1])
+    return f"{name}_{model}"[:63].rstrip("_-")
+
+
+def get_collection(
+    name: str,
+    client: chromadb.ClientAPI | None = None,
+    embedding_function: object | None = None,
+) -> chromadb.Collection:
+    client = client or get_shared_chroma_client()
+    return client.get_or_create_collection(
+        name=_collection_name(name),
+        metadata={"hnsw:space": "cosine", "embedding_model": settings.embedding_model},
+        embedding_function=embedding_function or get_embedding_function(),
+    )
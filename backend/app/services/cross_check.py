@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any
+
+from app.core.config import get_settings
+from app.services.websearch import WebSearchClient, WebSearchError, web_search_client
+
+settings = get_settings()
+_TOKEN_RE = re.compile(r"\w+")
+# Set in the task that reserved an idle pacer slot; its next search spends it instead of pacing again.
+_reserved_slot: ContextVar[bool] = ContextVar("cross_check_reserved_slot", default=False)
+
+
+def normalize_query(query: str) -> tuple[str, frozenset[str]]:
+    tokens = frozenset(_TOKEN_RE.findall(query.lower()))
+    return " ".join(sorted(tokens)), tokens
+
+
+def _similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+class CrossCheckCoordinator:
+    def __init__(self, client: WebSearchClient = web_search_client) -> None:
+        self._client = client
+        self._in_flight: dict[str, tuple[frozenset[str], asyncio.Future[list[dict[str, Any]]]]] = {}
+        self._recent: OrderedDict[str, tuple[frozenset[str], float, list[dict[str, Any]]]] = OrderedDict()
+        self._next_slot = 0.0
+
+    def clear(self) -> None:
+        self._in_flight.clear()
+        self._recent.clear()
+        self._next_slot = 0.0
+
+    def idle_delay(self) -> float | None:
+        # Seconds until the pacer has a slot nobody else claimed; None while searches are running.
+        if self._in_flight:
+            return None
+        return max(0.0, self._next_slot - time.monotonic())
+
+    def try_reserve_idle_slot(self) -> bool:
+        now = time.monotonic()
+        if self._in_flight or self._next_slot > now:
+            return False
+        self._next_slot = now + 60 / max(1, settings.global_rate_limit_per_minute)
+        _reserved_slot.set(True)
+        return True
+
+    def _find_recent(self, key: str, tokens: frozenset[str], now: float) -> list[dict[str, Any]] | None:
+        expired = [other for other, (_, expires_at, _) in self._recent.items() if expires_at <= now]
+        for other in expired:
+            self._recent.pop(other, None)
+        exact = self._recent.get(key)
+        if exact is not None:
+            return exact[2]
+        threshold = settings.cross_check_query_similarity
+        for other_tokens, _, results in self._recent.values():
+            if _similarity(tokens, other_tokens) >= threshold:
+                return results
+        return None
+
+    def _find_in_flight(
+        self, key: str, tokens: frozenset[str]
+    ) -> asyncio.Future[list[dict[str, Any]]] | None:
+        exact = self._in_flight.get(key)
+        if exact is not None:
+            return exact[1]
+        threshold = settings.cross_check_query_similarity
+        for other_tokens, future in self._in_flight.values():
+            if _similarity(tokens, other_tokens) >= threshold:
+                return future
+        return None
+
+    def _remember(self, key: str, tokens: frozenset[str], results: list[dict[str, Any]]) -> None:
+        ttl = settings.web_search_cache_minutes_min * 60
+        self._recent[key] = (tokens, time.monotonic() + ttl, results)
+        self._recent.move_to_end(key)
+        while len(self._recent) > max(1, settings.web_search_cache_max_entries):
+            self._recent.popitem(last=False)
+
+    async def _pace(self) -> None:
+        if _reserved_slot.get():
+            _reserved_slot.set(False)
+            return
+        interval = 60 / max(1, settings.global_rate_limit_per_minute)
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        if slot - now > settings.cross_check_max_wait_seconds:
+            raise WebSearchError("Лимит запросов поиска исчерпан.")
+        self._next_slot = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def search(self, query: str) -> list[dict[str, Any]]:
+        key, tokens = normalize_query(query)
+        recent = self._find_recent(key, tokens, time.monotonic())
+        if recent is not None:
+            return recent
+        shared = self._find_in_flight(key, tokens)
+        if shared is not None:
+            return await asyncio.shield(shared)
+
+        future: asyncio.Future[list[dict[str, Any]]] = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._in_flight[key] = (tokens, future)
+        try:
+            # Only real network fetches take a pacing slot; cache hits answer immediately.
+            results = await self._client.cached(query)
+            if results is None:
+                await self._pace()
+                results = await self._client.search(query, cache_checked=True)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(results)
+            self._remember(key, tokens, results)
+            return results
+        finally:
+            self._in_flight.pop(key, None)
+
+
+cross_check_coordinator = CrossCheckCoordinator()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import release_connection
+from app.models.deepdive import DeepDiveReport
+from app.models.item import Item
+from app.services.ai_assistant import generate_base_deepdive_report
+from app.services.item_vectors import find_similar_items
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def get_precomputed_report(session: AsyncSession, item_id: int) -> str | None:
+    entry = await session.get(DeepDiveReport, item_id)
+    return entry.report if entry else None
+
+
+async def _reports_today(session: AsyncSession) -> int:
+    start_of_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    result = await session.execute(
+        select(func.count()).select_from(DeepDiveReport).where(
+            DeepDiveReport.created_at >= start_of_day
+        )
+    )
+    return result.scalar_one()
+
+
+def deepdive_wanted(item: Item) -> bool:
+    return settings.deepdive_precompute_enabled and item.impact == "high"
+
+
+async def precompute_deepdive(session: AsyncSession, item: Item) -> bool:
+    if not deepdive_wanted(item):
+        return False
+    if await session.get(DeepDiveReport, item.id):
+        return False
+    if await _reports_today(session) >= settings.deepdive_precompute_daily_budget:
+        logger.info("DeepDive precompute budget exhausted, skipping item %s", item.id)
+        return False
+    related = await find_similar_items(session, item)
+    await release_connection(session)
+    report = await generate_base_deepdive_report(item, [other for other, _ in related])
+    if not report:
+        return False
+    session.add(DeepDiveReport(item_id=item.id, report=report))
+    await session.flush()
+    return True
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlparse
+
+import feedparser
+import httpx
+
+from app.core.config import get_settings
+from app.core.process_pool import run_in_process_pool
+
+settings = get_settings()
+_ACCEPT = (
+    "application/rss+xml, application/atom+xml, application/xml;q=0.9, "
+    "text/xml;q=0.9, */*;q=0.1"
+)
+
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+else:
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+
+
+class FeedFetchError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+@dataclass
+class FetchedFeed:
+    status: int
+    content: bytes = b""
+    content_type: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    url: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+@dataclass
+class _HostLimit:
+    semaphore: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(max(1, settings.feed_fetch_per_host_concurrency))
+    )
+    users: int = 0
+
+
+class FeedFetcher:
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, _HostLimit] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.ingestion_request_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=settings.feed_fetch_max_connections,
+                    max_keepalive_connections=settings.feed_fetch_max_connections,
+                ),
+                follow_redirects=True,
+                headers={
+                    "User-Agent": f"{settings.app_name}/1.0",
+                    "Accept": _ACCEPT,
+                    "Accept-Encoding": _ACCEPT_ENCODING,
+                },
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        host = urlparse(url).netloc.lower()
+        limit = self._host_limits.setdefault(host, _HostLimit())
+        limit.users += 1
+        try:
+            async with limit.semaphore:
+                yield
+        finally:
+            limit.users -= 1
+            # Drop idle hosts so the map only holds hosts with fetches in progress.
+            if limit.users == 0 and self._host_limits.get(host) is limit:
+                del self._host_limits[host]
+
+    async def fetch(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        timeout: float | None = None,
+    ) -> FetchedFeed:
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        max_bytes = settings.feed_fetch_max_bytes
+        async with self._host_slot(url), asyncio.timeout(timeout):
+            async with self._get_client().stream("GET", url, headers=headers) as response:
+                if response.status_code == 304:
+                    return FetchedFeed(status=304, etag=etag, last_modified=last_modified)
+                if response.status_code >= 400:
+                    raise FeedFetchError(f"Feed returned HTTP {response.status_code}.")
+                declared_length = response.headers.get("content-length", "")
+                if declared_length.isdigit() and int(declared_length) > max_bytes:
+                    raise FeedFetchError(f"Feed exceeds {max_bytes} bytes.")
+                chunks: list[bytes] = []
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise FeedFetchError(f"Feed exceeds {max_bytes} bytes.")
+                    chunks.append(chunk)
+                return FetchedFeed(
+                    status=response.status_code,
+                    content=b"".join(chunks),
+                    content_type=response.headers.get("content-type"),
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                    url=str(response.url),
+                )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_limits.clear()
+
+
+def _parse_feed_bytes(content: bytes, content_type: str | None, url: str | None) -> Any:
+    headers: dict[str, str] = {}
+    if content_type:
+        headers["content-type"] = content_type
+    if url:
+        # Parsing bytes has no base URL; relative links resolve against the final feed URL.
+        headers["content-location"] = url
+    return feedparser.parse(content, response_headers=headers or None)
+
+
+async def parse_feed(
+    content: bytes, content_type: str | None = None, url: str | None = None
+) -> Any:
+    if len(content) >= settings.feed_parse_process_threshold_bytes:
+        return await run_in_process_pool(_parse_feed_bytes, content, content_type, url)
+    return await asyncio.to_thread(_parse_feed_bytes, content, content_type, url)
+
+
+feed_fetcher = FeedFetcher()
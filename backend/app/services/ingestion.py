@@ -8,36 +8,50 @@ import re
 import time
 from urllib.parse import urlparse
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
 
 import asyncpraw
-import feedparser
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError
 from telethon.sessions import StringSession
 
 from app.core.config import get_settings
-from app.db.session import SessionLocal
 from app.models.item import Item
 from app.models.source import Source
-from app.services.autotagging import assign_topics
 from app.services.alerts import create_alert
-from app.services.delivery import enqueue_instant_delivery
-from app.services.sentinel import apply_sentinel
+from app.services.feed_fetcher import feed_fetcher, parse_feed
+from app.services.near_duplicates import assign_clusters, compute_simhash
+from app.services.pipeline import PIPELINE_ENTRY_STAGE
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 _TAG_RE = re.compile(r"<[^>]+>")
 _HASH_TEXT_LIMIT = 500
 _FLOODWAIT_MAX_SECONDS = 300
-
-
-async def _run_with_retries(coro_factory, retries: int, timeout_seconds: int):
+_HASH_LOOKUP_BATCH = 500
+_INSERT_BATCH = 200
+_ITEM_INSERT_COLUMNS = (
+    "source_id",
+    "external_id",
+    "url",
+    "title",
+    "text",
+    "published_at",
+    "content_hash",
+    "lang",
+    "is_job",
+)
+
+
+async def _run_with_retries(coro_factory, retries: int, timeout_seconds: int | None):
     attempts = max(1, retries)
     backoff = 1
+    max_backoff = timeout_seconds or settings.ingestion_request_timeout_seconds
     for attempt in range(attempts):
         try:
             return await asyncio.wait_for(coro_factory(), timeout=timeout_seconds)
@@ -45,7 +59,7 @@ async def _run_with_retries(coro_factory, retries: int, timeout_seconds: int):
             if attempt >= attempts - 1:
                 raise
             await asyncio.sleep(backoff)
-            backoff = min(backoff * 2, timeout_seconds)
+            backoff = min(backoff * 2, max_backoff)
 
 
 @dataclass
@@ -91,6 +105,61 @@ def compute_content_hash(title: str, url: str | None, text: str) -> str:
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
+async def _existing_hashes(session: AsyncSession, hashes: Iterable[str]) -> set[str]:
+    unique = list(dict.fromkeys(hashes))
+    existing: set[str] = set()
+    for start in range(0, len(unique), _HASH_LOOKUP_BATCH):
+        chunk = unique[start : start + _HASH_LOOKUP_BATCH]
+        result = await session.execute(
+            select(Item.content_hash).where(Item.content_hash.in_(chunk))
+        )
+        existing.update(result.scalars().all())
+    return existing
+
+
+def _filter_unseen(
+    candidates: list[tuple[Any, Item]], existing: set[str]
+) -> list[tuple[Any, Item]]:
+    unseen: list[tuple[Any, Item]] = []
+    for marker, item in candidates:
+        if item.content_hash in existing:
+            continue
+        existing.add(item.content_hash)
+        unseen.append((marker, item))
+    return unseen
+
+
+def _insert_statement(session: AsyncSession):
+    if session.bind.dialect.name == "postgresql":
+        return pg_insert(Item)
+    return sqlite_insert(Item)
+
+
+async def _insert_new_items(session: AsyncSession, items: list[Item]) -> list[Item]:
+    inserted: list[Item] = []
+    for start in range(0, len(items), _INSERT_BATCH):
+        rows = [
+            {
+                **{column: getattr(item, column) for column in _ITEM_INSERT_COLUMNS},
+                "simhash": compute_simhash(f"{item.title} {item.text}"),
+                "pipeline_stage": PIPELINE_ENTRY_STAGE,
+            }
+            for item in items[start : start + _INSERT_BATCH]
+        ]
+        stmt = (
+            _insert_statement(session)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["content_hash"])
+            .returning(Item)
+        )
+        result = await session.scalars(stmt)
+        inserted.extend(result.all())
+    order = {item.content_hash: index for index, item in enumerate(items)}
+    inserted.sort(key=lambda item: order.get(item.content_hash, 0))
+    await assign_clusters(session, inserted)
+    return inserted
+
+
 def _extract_entry_text(entry: dict) -> str:
     text = entry.get("summary") or entry.get("description")
     content_list = entry.get("content")
@@ -216,9 +285,11 @@ async def ingest_telegram_source(
             settings.ingestion_request_timeout_seconds,
         )
     except FloodWaitError as exc:
-        sleep_seconds = min(exc.seconds, _FLOODWAIT_MAX_SECONDS)
-        logger.warning("Telegram FloodWait for source %s: %s seconds", source.id, sleep_seconds)
-        await asyncio.sleep(sleep_seconds)
+        wait_seconds = min(exc.seconds, _FLOODWAIT_MAX_SECONDS)
+        logger.warning("Telegram FloodWait for source %s: %s seconds", source.id, wait_seconds)
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=wait_seconds)
+        state["retry_after"] = retry_at.isoformat()
+        source.state = state
         return 0
     except Exception as exc:
         logger.exception("Telegram ingestion failed for source %s", source.id)
@@ -230,12 +301,12 @@ async def ingest_telegram_source(
         )
         return 0
 
-    added = 0
     newest_id = last_message_id
     newest_date = last_message_date
     lang = _normalize_lang(None)
     channel_title = getattr(entity, "title", None) or source.name
     channel_username = getattr(entity, "username", None)
+    candidates: list[tuple[object, Item]] = []
     for message in messages:
         message_text = _telegram_message_text(message)
         title = _telegram_message_title(message_text, channel_title)
@@ -247,9 +318,6 @@ async def ingest_telegram_source(
         if channel_username:
             url = f"https://t.me/{channel_username}/{getattr(message, 'id', '')}"
         content_hash = compute_content_hash(title, url, message_text)
-        exists = await session.execute(select(Item.id).where(Item.content_hash == content_hash))
-        if exists.scalar_one_or_none():
-            continue
         published_at = _ensure_utc(getattr(message, "date", None))
         is_job = _is_job_post(source, title, message_text)
         item = Item(
@@ -263,23 +331,14 @@ async def ingest_telegram_source(
             lang=lang,
             is_job=is_job,
         )
-        session.add(item)
-        try:
-            await session.flush()
-        except IntegrityError:
-            await session.rollback()
-            await session.refresh(source)
+        candidates.append((message, item))
+    existing = await _existing_hashes(session, [item.content_hash for _, item in candidates])
+    unseen = _filter_unseen(candidates, existing)
+    inserted = await _insert_new_items(session, [item for _, item in unseen])
+    inserted_hashes = {item.content_hash for item in inserted}
+    for message, item in unseen:
+        if item.content_hash not in inserted_hashes:
             continue
-        try:
-            await assign_topics(session, item)
-            await apply_sentinel(item, source)
-            await enqueue_instant_delivery(session, item)
-        except Exception:
-            logger.exception(
-                "Post-ingestion pipeline failed for telegram item %s; continuing ingestion",
-                item.title,
-            )
-        added += 1
         message_id = getattr(message, "id", None)
         if isinstance(message_id, int) and (newest_id is None or message_id > newest_id):
             newest_id = message_id
@@ -292,7 +351,28 @@ async def ingest_telegram_source(
     if newest_date:
         state["last_message_date"] = newest_date.isoformat()
     source.state = state
-    return added
+    return len(inserted)
+
+
+def telegram_configured() -> bool:
+    return bool(settings.telethon_api_id and settings.telethon_api_hash and settings.telethon_session)
+
+
+def build_telegram_client() -> TelegramClient:
+    return TelegramClient(
+        StringSession(settings.telethon_session),
+        int(settings.telethon_api_id),
+        settings.telethon_api_hash,
+    )
+
+
+async def alert_telegram_misconfigured(session: AsyncSession, source: Source) -> None:
+    await create_alert(
+        session,
+        dedup_key=f"ingestion_telegram_{source.id}",
+        title="Telegram ingestion misconfigured",
+        message="Missing TELETHON_API_ID/TELETHON_API_HASH/TELETHON_SESSION",
+    )
 
 
 async def ingest_telegram(session: AsyncSession) -> IngestionResult:
@@ -300,21 +380,12 @@ async def ingest_telegram(session: AsyncSession) -> IngestionResult:
     sources = result.scalars().all()
     if not sources:
         return IngestionResult(source="telegram", items_processed=0)
-    if not (settings.telethon_api_id and settings.telethon_api_hash and settings.telethon_session):
+    if not telegram_configured():
         for source in sources:
-            await create_alert(
-                session,
-                dedup_key=f"ingestion_telegram_{source.id}",
-                title="Telegram ingestion misconfigured",
-                message="Missing TELETHON_API_ID/TELETHON_API_HASH/TELETHON_SESSION",
-            )
+            await alert_telegram_misconfigured(session, source)
         return IngestionResult(source="telegram", items_processed=0)
     processed = 0
-    async with TelegramClient(
-        StringSession(settings.telethon_session),
-        int(settings.telethon_api_id),
-        settings.telethon_api_hash,
-    ) as client:
+    async with build_telegram_client() as client:
         for source in sources:
             processed += await ingest_telegram_source(session, client, source)
     return IngestionResult(source="telegram", items_processed=processed)
@@ -366,10 +437,10 @@ async def ingest_reddit_source(
         return 0
 
     posts.sort(key=lambda item: getattr(item, "created_utc", 0) or 0)
-    added = 0
     newest_created = last_created_utc
     newest_post_id: str | None = None
     lang = _normalize_lang(None)
+    candidates: list[tuple[object, Item]] = []
     for submission in posts:
         title = str(getattr(submission, "title", "") or "").strip()
         if not title:
@@ -379,9 +450,6 @@ async def ingest_reddit_source(
             text = title
         url = getattr(submission, "url", None)
         content_hash = compute_content_hash(title, url, text)
-        exists = await session.execute(select(Item.id).where(Item.content_hash == content_hash))
-        if exists.scalar_one_or_none():
-            continue
         created_utc = float(getattr(submission, "created_utc", 0) or 0)
         published_at = datetime.fromtimestamp(created_utc, tz=timezone.utc) if created_utc else None
         is_job = _is_job_post(source, title, text)
@@ -396,23 +464,15 @@ async def ingest_reddit_source(
             lang=lang,
             is_job=is_job,
         )
-        session.add(item)
-        try:
-            await session.flush()
-        except IntegrityError:
-            await session.rollback()
-            await session.refresh(source)
+        candidates.append((submission, item))
+    existing = await _existing_hashes(session, [item.content_hash for _, item in candidates])
+    unseen = _filter_unseen(candidates, existing)
+    inserted = await _insert_new_items(session, [item for _, item in unseen])
+    inserted_hashes = {item.content_hash for item in inserted}
+    for submission, item in unseen:
+        if item.content_hash not in inserted_hashes:
             continue
-        try:
-            await assign_topics(session, item)
-            await apply_sentinel(item, source)
-            await enqueue_instant_delivery(session, item)
-        except Exception:
-            logger.exception(
-                "Post-ingestion pipeline failed for reddit item %s; continuing ingestion",
-                item.title,
-            )
-        added += 1
+        created_utc = float(getattr(submission, "created_utc", 0) or 0)
         if created_utc and (newest_created is None or created_utc > newest_created):
             newest_created = created_utc
             newest_post_id = getattr(submission, "id", None)
@@ -422,7 +482,29 @@ async def ingest_reddit_source(
     if newest_post_id:
         state["last_post_id"] = newest_post_id
     source.state = state
-    return added
+    return len(inserted)
+
+
+def reddit_configured() -> bool:
+    return bool(settings.reddit_client_id and settings.reddit_client_secret and settings.reddit_user_agent)
+
+
+def build_reddit_client() -> asyncpraw.Reddit:
+    return asyncpraw.Reddit(
+        client_id=settings.reddit_client_id,
+        client_secret=settings.reddit_client_secret,
+        user_agent=settings.reddit_user_agent,
+        requestor_kwargs={"timeout": settings.ingestion_request_timeout_seconds},
+    )
+
+
+async def alert_reddit_misconfigured(session: AsyncSession, source: Source) -> None:
+    await create_alert(
+        session,
+        dedup_key=f"ingestion_reddit_{source.id}",
+        title="Reddit ingestion misconfigured",
+        message="Missing REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET/REDDIT_USER_AGENT",
+    )
 
 
 async def ingest_reddit(session: AsyncSession) -> IngestionResult:
@@ -430,22 +512,12 @@ async def ingest_reddit(session: AsyncSession) -> IngestionResult:
     sources = result.scalars().all()
     if not sources:
         return IngestionResult(source="reddit", items_processed=0)
-    if not (settings.reddit_client_id and settings.reddit_client_secret and settings.reddit_user_agent):
+    if not reddit_configured():
         for source in sources:
-            await create_alert(
-                session,
-                dedup_key=f"ingestion_reddit_{source.id}",
-                title="Reddit ingestion misconfigured",
-                message="Missing REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET/REDDIT_USER_AGENT",
-            )
+            await alert_reddit_misconfigured(session, source)
         return IngestionResult(source="reddit", items_processed=0)
     processed = 0
-    reddit = asyncpraw.Reddit(
-        client_id=settings.reddit_client_id,
-        client_secret=settings.reddit_client_secret,
-        user_agent=settings.reddit_user_agent,
-        requestor_kwargs={"timeout": settings.ingestion_request_timeout_seconds},
-    )
+    reddit = build_reddit_client()
     try:
         for source in sources:
             processed += await ingest_reddit_source(session, reddit, source)
@@ -457,15 +529,37 @@ async def ingest_reddit(session: AsyncSession) -> IngestionResult:
 async def ingest_rss_source(session: AsyncSession, source: Source) -> int:
     if not source.url:
         return 0
+    state = dict(source.state or {})
+    etag = state.get("etag")
+    last_modified = state.get("last_modified")
     try:
-        feed = await _run_with_retries(
-            lambda: asyncio.to_thread(feedparser.parse, source.url),
+        # The fetcher starts the timeout only once a per-host slot is acquired.
+        fetched = await _run_with_retries(
+            lambda: feed_fetcher.fetch(
+                source.url,
+                etag=etag,
+                last_modified=last_modified,
+                timeout=settings.ingestion_request_timeout_seconds,
+            ),
             settings.ingestion_request_retries,
-            settings.ingestion_request_timeout_seconds,
+            None,
         )
     except Exception:
         logger.exception("RSS fetch failed for source %s", source.id)
         return 0
+    if fetched.not_modified:
+        state["last_ingested_at"] = datetime.now(timezone.utc).isoformat()
+        source.state = state
+        return 0
+    try:
+        feed = await parse_feed(fetched.content, fetched.content_type, fetched.url)
+    except Exception:
+        logger.exception("RSS parse failed for source %s", source.id)
+        return 0
+    if fetched.etag:
+        state["etag"] = fetched.etag
+    if fetched.last_modified:
+        state["last_modified"] = fetched.last_modified
     entries = list(getattr(feed, "entries", []) or [])
     feed_meta = getattr(feed, "feed", {}) or {}
     feed_lang = None
@@ -474,7 +568,6 @@ async def ingest_rss_source(session: AsyncSession, source: Source) -> int:
     else:
         feed_lang = getattr(feed_meta, "language", None) or getattr(feed_meta, "lang", None)
     lang = _normalize_lang(str(feed_lang) if feed_lang else None)
-    state = dict(source.state or {})
     last_published_at = None
     if state.get("last_published_at"):
         try:
@@ -484,7 +577,7 @@ async def ingest_rss_source(session: AsyncSession, source: Source) -> int:
     if last_published_at and last_published_at.tzinfo is None:
         last_published_at = last_published_at.replace(tzinfo=timezone.utc)
     newest_seen = last_published_at
-    added = 0
+    candidates: list[tuple[Any, Item]] = []
     for entry in entries:
         title = str(entry.get("title") or "").strip()
         if not title:
@@ -495,9 +588,6 @@ async def ingest_rss_source(session: AsyncSession, source: Source) -> int:
             text = title
         url = entry.get("link")
         content_hash = compute_content_hash(title, url, text)
-        exists = await session.execute(select(Item.id).where(Item.content_hash == content_hash))
-        if exists.scalar_one_or_none():
-            continue
         is_job = _is_job_post(source, title, text)
         item = Item(
             source_id=source.id,
@@ -510,30 +600,19 @@ async def ingest_rss_source(session: AsyncSession, source: Source) -> int:
             lang=lang,
             is_job=is_job,
         )
-        session.add(item)
-        try:
-            await session.flush()
-        except IntegrityError:
-            await session.rollback()
-            await session.refresh(source)
-            continue
-        try:
-            await assign_topics(session, item)
-            await apply_sentinel(item, source)
-            await enqueue_instant_delivery(session, item)
-        except Exception:
-            logger.exception(
-                "Post-ingestion pipeline failed for item %s; continuing ingestion",
-                item.title,
-            )
-        added += 1
+        candidates.append((entry, item))
+    existing = await _existing_hashes(session, [item.content_hash for _, item in candidates])
+    unseen = _filter_unseen(candidates, existing)
+    inserted = await _insert_new_items(session, [item for _, item in unseen])
+    for item in inserted:
+        published_at = _ensure_utc(item.published_at)
         if published_at and (newest_seen is None or published_at > newest_seen):
             newest_seen = published_at
     state["last_ingested_at"] = datetime.now(timezone.utc).isoformat()
     if newest_seen:
         state["last_published_at"] = newest_seen.isoformat()
     source.state = state
-    return added
+    return len(inserted)
 
 
 async def ingest_rss(session: AsyncSession) -> IngestionResult:
@@ -543,30 +622,3 @@ async def ingest_rss(session: AsyncSession) -> IngestionResult:
     for source in sources:
         processed += await ingest_rss_source(session, source)
     return IngestionResult(source="rss", items_processed=processed)
-
-
-async def ingestion_loop(stop_event: asyncio.Event) -> None:
-    while not stop_event.is_set():
-        async with SessionLocal() as session:
-            try:
-                await ingest_rss(session)
-                await session.commit()
-            except Exception:
-                logger.exception("RSS ingestion failed")
-                await session.rollback()
-            try:
-                await ingest_telegram(session)
-                await session.commit()
-            except Exception:
-                logger.exception("Telegram ingestion failed")
-                await session.rollback()
-            try:
-                await ingest_reddit(session)
-                await session.commit()
-            except Exception:
-                logger.exception("Reddit ingestion failed")
-                await session.rollback()
-        try:
-            await asyncio.wait_for(stop_event.wait(), timeout=settings.ingestion_interval_seconds)
-        except asyncio.TimeoutError:
-            continue
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.source import Source
+from app.services import ingestion
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+_SOURCE_TYPES = ("rss", "telegram", "reddit")
+_SOURCE_REFRESH_SECONDS = 30
+_MIN_SLEEP_SECONDS = 1.0
+_RATE_SMOOTHING = 0.3
+_TARGET_ITEMS_PER_POLL = 1.0
+_SILENCE_FACTOR = 0.25
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _newest_published_at(state: dict) -> float | None:
+    candidates = [
+        _parse_timestamp(state.get("last_published_at")),
+        _parse_timestamp(state.get("last_message_date")),
+    ]
+    last_created_utc = state.get("last_created_utc")
+    if isinstance(last_created_utc, (int, float)) and last_created_utc > 0:
+        candidates.append(float(last_created_utc))
+    known = [value for value in candidates if value is not None]
+    return max(known) if known else None
+
+
+def _observed_count(previous: dict, state: dict, added: int) -> int:
+    old_id = previous.get("last_message_id")
+    new_id = state.get("last_message_id")
+    if isinstance(old_id, int) and isinstance(new_id, int) and new_id > old_id:
+        return max(added, new_id - old_id)
+    return added
+
+
+def update_poll_stats(previous: dict | None, state: dict, added: int, now: float) -> dict:
+    previous = previous or {}
+    last_polled = _parse_timestamp(previous.get("last_polled_at"))
+    if last_polled is not None and now > last_polled:
+        hours = (now - last_polled) / 3600
+        rate = _observed_count(previous, state, added) / hours
+        previous_rate = previous.get("poll_rate_per_hour")
+        if isinstance(previous_rate, (int, float)):
+            rate = _RATE_SMOOTHING * rate + (1 - _RATE_SMOOTHING) * previous_rate
+        state["poll_rate_per_hour"] = round(rate, 6)
+    state["last_polled_at"] = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+    return state
+
+
+def poll_interval(state: dict | None, now: float) -> float:
+    state = state or {}
+    floor = float(max(1, settings.ingestion_min_interval_seconds))
+    ceiling = float(max(floor, settings.ingestion_max_interval_seconds))
+    rate = state.get("poll_rate_per_hour")
+    if not isinstance(rate, (int, float)):
+        interval = float(settings.ingestion_interval_seconds)
+    elif rate <= 0:
+        interval = ceiling
+    else:
+        interval = 3600 * _TARGET_ITEMS_PER_POLL / rate
+    newest = _newest_published_at(state)
+    if newest is not None and now > newest:
+        interval = max(interval, (now - newest) * _SILENCE_FACTOR)
+    return min(ceiling, max(floor, interval))
+
+
+def next_run_at(state: dict | None, now: float) -> float:
+    state = state or {}
+    run_at = now
+    last_runs = [
+        value
+        for value in (
+            _parse_timestamp(state.get("last_polled_at")),
+            _parse_timestamp(state.get("last_ingested_at")),
+        )
+        if value is not None
+    ]
+    if last_runs:
+        run_at = max(run_at, max(last_runs) + poll_interval(state, now))
+    retry_after = _parse_timestamp(state.get("retry_after"))
+    if retry_after is not None:
+        run_at = max(run_at, retry_after)
+    return run_at
+
+
+class IngestionScheduler:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] = SessionLocal
+    ) -> None:
+        self._session_factory = session_factory
+        self._sources: dict[int, str] = {}
+        self._next_run: dict[int, float] = {}
+        self._in_flight: dict[int, asyncio.Task] = {}
+        self._workers = asyncio.Semaphore(max(1, settings.ingestion_max_workers))
+        self._type_limits = {
+            "rss": asyncio.Semaphore(max(1, settings.ingestion_rss_concurrency)),
+            "telegram": asyncio.Semaphore(max(1, settings.ingestion_telegram_concurrency)),
+            "reddit": asyncio.Semaphore(max(1, settings.ingestion_reddit_concurrency)),
+        }
+        self._clients = AsyncExitStack()
+        self._clients_lock = asyncio.Lock()
+        self._telegram_client: Any = None
+        self._reddit_client: Any = None
+        self._sources_refreshed_at = 0.0
+
+    async def refresh_sources(self) -> None:
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Source.id, Source.source_type, Source.state).where(
+                    Source.source_type.in_(_SOURCE_TYPES)
+                )
+            )
+            rows = result.all()
+        now = time.time()
+        sources: dict[int, str] = {}
+        for source_id, source_type, state in rows:
+            sources[source_id] = source_type
+            if source_id not in self._next_run:
+                self._next_run[source_id] = next_run_at(state, now)
+        for removed_id in set(self._next_run) - set(sources):
+            self._next_run.pop(removed_id, None)
+        self._sources = sources
+        self._sources_refreshed_at = now
+
+    def dispatch_due(self, now: float) -> list[asyncio.Task]:
+        dispatched: list[asyncio.Task] = []
+        for source_id, source_type in self._sources.items():
+            if source_id in self._in_flight:
+                continue
+            if self._next_run.get(source_id, now) > now:
+                continue
+            task = asyncio.create_task(self._run_source(source_id, source_type))
+            self._in_flight[source_id] = task
+            task.add_done_callback(lambda _, key=source_id: self._in_flight.pop(key, None))
+            dispatched.append(task)
+        return dispatched
+
+    def _seconds_until_next(self, now: float) -> float:
+        candidates = [self._sources_refreshed_at + _SOURCE_REFRESH_SECONDS - now]
+        for source_id, run_at in self._next_run.items():
+            if source_id not in self._in_flight:
+                candidates.append(run_at - now)
+        return max(_MIN_SLEEP_SECONDS, min(candidates))
+
+    async def _run_source(self, source_id: int, source_type: str) -> None:
+        state: dict | None = None
+        async with self._type_limits[source_type]:
+            async with self._workers:
+                try:
+                    state = await self._ingest_source(source_id, source_type)
+                except Exception:
+                    logger.exception("Ingestion failed for source %s", source_id)
+        now = time.time()
+        # Failed or misconfigured runs have no fresh last_ingested_at; still wait a full interval.
+        self._next_run[source_id] = max(next_run_at(state, now), now + poll_interval(state, now))
+
+    async def _ingest_source(self, source_id: int, source_type: str) -> dict | None:
+        async with self._session_factory() as session:
+            source = await session.get(Source, source_id)
+        if not source or source.source_type != source_type:
+            return None
+        # The read session is closed: the ingest session below only checks out a
+        # connection once the network fetch is done and items are written.
+        async with self._session_factory() as session:
+            session.add(source)
+            previous_state = dict(source.state or {})
+            added = 0
+            try:
+                if source_type == "rss":
+                    added = await ingestion.ingest_rss_source(session, source)
+                elif source_type == "telegram":
+                    client = await self._get_telegram_client()
+                    if client is None:
+                        await ingestion.alert_telegram_misconfigured(session, source)
+                    else:
+                        added = await ingestion.ingest_telegram_source(session, client, source)
+                elif source_type == "reddit":
+                    reddit = await self._get_reddit_client()
+                    if reddit is None:
+                        await ingestion.alert_reddit_misconfigured(session, source)
+                    else:
+                        added = await ingestion.ingest_reddit_source(session, reddit, source)
+                source.state = update_poll_stats(
+                    previous_state, dict(source.state or {}), added, time.time()
+                )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            return dict(source.state or {})
+
+    async def _get_telegram_client(self) -> Any:
+        if not ingestion.telegram_configured():
+            return None
+        async with self._clients_lock:
+            if self._telegram_client is None:
+                client = ingestion.build_telegram_client()
+                self._telegram_client = await self._clients.enter_async_context(client)
+            return self._telegram_client
+
+    async def _get_reddit_client(self) -> Any:
+        if not ingestion.reddit_configured():
+            return None
+        async with self._clients_lock:
+            if self._reddit_client is None:
+                reddit = ingestion.build_reddit_client()
+                self._clients.push_async_callback(reddit.close)
+                self._reddit_client = reddit
+            return self._reddit_client
+
+    async def shutdown(self) -> None:
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        await self._clients.aclose()
+        self._telegram_client = None
+        self._reddit_client = None
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        try:
+            while not stop_event.is_set():
+                now = time.time()
+                if now - self._sources_refreshed_at >= _SOURCE_REFRESH_SECONDS:
+                    try:
+                        await self.refresh_sources()
+                    except Exception:
+                        logger.exception("Failed to load ingestion sources")
+                        self._sources_refreshed_at = now
+                self.dispatch_due(time.time())
+                try:
+                    await asyncio.wait_for(
+                        stop_event.wait(), timeout=self._seconds_until_next(time.time())
+                    )
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            await self.shutdown()
+
+
+async def ingestion_loop(stop_event: asyncio.Event) -> None:
+    await IngestionScheduler().run(stop_event)
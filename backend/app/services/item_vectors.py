@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.item import Item, ItemTopic
+from app.services.chroma import get_collection
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+_COLLECTION_NAME = "items"
+_MAX_DOCUMENT_LENGTH = 2000
+_NO_TOPIC = -1
+
+
+def _item_timestamp(item: Item) -> int:
+    value = item.published_at or item.created_at or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _item_document(item: Item) -> str:
+    return f"{item.title}\n\n{item.text or ''}"[:_MAX_DOCUMENT_LENGTH]
+
+
+def _item_metadata(item: Item, topic_ids: list[int]) -> dict[str, Any]:
+    return {
+        "source_id": item.source_id,
+        "topic_id": topic_ids[0] if topic_ids else _NO_TOPIC,
+        "topics": "," + ",".join(str(topic_id) for topic_id in topic_ids) + ",",
+        "published_ts": _item_timestamp(item),
+    }
+
+
+class ItemVectorIndex:
+    def __init__(self, client: Any = None, embedding_function: Any = None) -> None:
+        self._client = client
+        self._embedding_function = embedding_function
+        self._collection: Any = None
+        self._sync_lock = asyncio.Lock()
+
+    def _get_collection(self) -> Any:
+        if self._collection is None:
+            self._collection = get_collection(
+                _COLLECTION_NAME, self._client, self._embedding_function
+            )
+        return self._collection
+
+    def _upsert(self, batch: dict[str, tuple[str, dict[str, Any]]]) -> None:
+        self._get_collection().upsert(
+            ids=list(batch),
+            documents=[document for document, _ in batch.values()],
+            metadatas=[metadata for _, metadata in batch.values()],
+        )
+
+    async def sync(self, session: AsyncSession) -> int:
+        # Items are picked up once tagging is done; the DB marker survives restarts.
+        async with self._sync_lock:
+            items = (
+                await session.execute(
+                    select(Item)
+                    .where(
+                        Item.vector_indexed_at.is_(None),
+                        or_(Item.pipeline_stage.is_(None), Item.pipeline_stage != "tag"),
+                    )
+                    .order_by(Item.id.desc())
+                    .limit(max(1, settings.item_vector_batch_size))
+                )
+            ).scalars().all()
+            if not items:
+                return 0
+            topics: dict[int, list[int]] = {}
+            rows = await session.execute(
+                select(ItemTopic.item_id, ItemTopic.topic_id)
+                .where(ItemTopic.item_id.in_([item.id for item in items]))
+                .order_by(ItemTopic.locked.desc(), ItemTopic.score.desc().nullslast())
+            )
+            for item_id, topic_id in rows.all():
+                topics.setdefault(item_id, []).append(topic_id)
+            batch = {
+                str(item.id): (_item_document(item), _item_metadata(item, topics.get(item.id, [])))
+                for item in items
+            }
+            await asyncio.to_thread(self._upsert, batch)
+            await session.execute(
+                update(Item)
+                .where(Item.id.in_([item.id for item in items]))
+                .values(vector_indexed_at=datetime.now(timezone.utc))
+            )
+            return len(items)
+
+    def _query(self, item: Item, since_ts: int, limit: int) -> list[tuple[int, float]]:
+        collection = self._get_collection()
+        stored = collection.get(ids=[str(item.id)], include=["embeddings"])
+        embeddings = stored.get("embeddings")
+        query: dict[str, Any] = {}
+        if embeddings is not None and len(embeddings):
+            query["query_embeddings"] = [list(embeddings[0])]
+        else:
+            query["query_texts"] = [_item_document(item)]
+        result = collection.query(
+            **query,
+            n_results=limit + 1,
+            where={"published_ts": {"$gte": since_ts}},
+            include=["distances"],
+        )
+        ids = result["ids"][0] if result["ids"] else []
+        distances = result["distances"][0] if result["distances"] else []
+        return [
+            (int(other_id), 1 - distance)
+            for other_id, distance in zip(ids, distances)
+            if other_id != str(item.id)
+        ][:limit]
+
+    async def similar(self, item: Item, days: int, limit: int) -> list[tuple[int, float]]:
+        since_ts = int(time.time()) - days * 86400
+        try:
+            return await asyncio.to_thread(self._query, item, since_ts, limit)
+        except Exception:
+            logger.exception("Related items lookup failed for item %s", item.id)
+            return []
+
+    async def run(
+        self,
+        stop_event: asyncio.Event,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+    ) -> None:
+        while not stop_event.is_set():
+            indexed = 0
+            async with session_factory() as session:
+                try:
+                    indexed = await self.sync(session)
+                    await session.commit()
+                except Exception:
+                    logger.exception("Failed to write item embeddings")
+                    await session.rollback()
+            if indexed >= max(1, settings.item_vector_batch_size):
+                continue
+            try:
+                await asyncio.wait_for(
+                    stop_event.wait(), timeout=settings.item_vector_flush_seconds
+                )
+            except asyncio.TimeoutError:
+                continue
+
+
+item_vector_index = ItemVectorIndex()
+
+
+async def find_similar_items(
+    session: AsyncSession, item: Item, days: int = 7, limit: int = 5
+) -> list[tuple[Item, float]]:
+    if not settings.item_vector_enabled:
+        return []
+    matches = await item_vector_index.similar(item, days, limit)
+    if not matches:
+        return []
+    result = await session.execute(
+        select(Item).where(Item.id.in_([item_id for item_id, _ in matches]))
+    )
+    items = {row.id: row for row in result.scalars().all()}
+    return [(items[item_id], score) for item_id, score in matches if item_id in items]
+
+
+async def item_vector_loop(stop_event: asyncio.Event) -> None:
+    if not settings.item_vector_enabled:
+        return
+    await item_vector_index.run(stop_event)
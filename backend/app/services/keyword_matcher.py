@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Hashable, Iterable, Mapping
+
+
+# Aho–Corasick automaton over all topic keywords: one pass over the text scores
+# every topic, counting non-overlapping hits per keyword like re.findall did.
+class KeywordMatcher:
+    def __init__(self, keywords_by_key: Mapping[Hashable, Iterable[str] | None]) -> None:
+        self._patterns: list[str] = []
+        self._weights: list[dict[Hashable, int]] = []
+        pattern_ids: dict[str, int] = {}
+        for key, keywords in keywords_by_key.items():
+            for keyword in keywords or ():
+                cleaned = keyword.strip().lower()
+                if not cleaned:
+                    continue
+                pattern_id = pattern_ids.get(cleaned)
+                if pattern_id is None:
+                    pattern_id = len(self._patterns)
+                    pattern_ids[cleaned] = pattern_id
+                    self._patterns.append(cleaned)
+                    self._weights.append({})
+                weights = self._weights[pattern_id]
+                weights[key] = weights.get(key, 0) + 1
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+        self._build()
+
+    def __bool__(self) -> bool:
+        return bool(self._patterns)
+
+    def _build(self) -> None:
+        own: list[list[int]] = [[]]
+        for pattern_id, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    own.append([])
+                state = next_state
+            own[state].append(pattern_id)
+        self._output = [()] * len(self._goto)
+        queue: deque[int] = deque()
+        for state in self._goto[0].values():
+            self._output[state] = tuple(own[state])
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = tuple(own[child]) + self._output[self._fail[child]]
+                queue.append(child)
+
+    def scores(self, text: str) -> dict[Hashable, float]:
+        if not self._patterns:
+            return {}
+        counts = [0] * len(self._patterns)
+        last_end = [-1] * len(self._patterns)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                start = position - len(self._patterns[pattern_id]) + 1
+                if start > last_end[pattern_id]:
+                    counts[pattern_id] += 1
+                    last_end[pattern_id] = position
+        totals: dict[Hashable, float] = {}
+        for pattern_id, count in enumerate(counts):
+            if not count:
+                continue
+            for key, weight in self._weights[pattern_id].items():
+                totals[key] = totals.get(key, 0.0) + count * weight
+        return totals
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.llm_cache import LlmCacheEntry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _normalize_content(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def cache_key(model: str, messages: list[dict[str, str]]) -> str:
+    normalized = [
+        [message.get("role", ""), _normalize_content(message.get("content") or "")]
+        for message in messages
+    ]
+    raw = json.dumps([model, normalized], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] = SessionLocal
+    ) -> None:
+        self._session_factory = session_factory
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def drain_stats(self) -> tuple[int, int]:
+        stats = (self.hits, self.misses)
+        self.hits = 0
+        self.misses = 0
+        return stats
+
+    def _remember(self, key: str, expires_at: float, response: str) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(1, settings.llm_cache_max_entries):
+            self._entries.popitem(last=False)
+
+    def _lookup_memory(self, key: str) -> str | None:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.time():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return cached[1]
+
+    async def _lookup_persistent(self, key: str) -> tuple[float, str] | None:
+        async with self._session_factory() as session:
+            entry = await session.get(LlmCacheEntry, key)
+        if entry is None:
+            return None
+        expires_at = entry.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at.timestamp() <= time.time():
+            return None
+        return expires_at.timestamp(), entry.response
+
+    async def get(self, model: str, messages: list[dict[str, str]]) -> str | None:
+        if not settings.llm_cache_enabled:
+            return None
+        key = cache_key(model, messages)
+        response = self._lookup_memory(key)
+        if response is None and settings.llm_cache_persistent:
+            try:
+                stored = await self._lookup_persistent(key)
+            except Exception:
+                logger.exception("Failed to read LLM cache")
+                stored = None
+            if stored is not None:
+                self._remember(key, *stored)
+                response = stored[1]
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    async def set(self, model: str, messages: list[dict[str, str]], response: str) -> None:
+        if not settings.llm_cache_enabled or not response:
+            return
+        key = cache_key(model, messages)
+        expires_at = time.time() + settings.llm_cache_ttl_seconds
+        self._remember(key, expires_at, response)
+        if not settings.llm_cache_persistent:
+            return
+        try:
+            async with self._session_factory() as session:
+                await session.merge(
+                    LlmCacheEntry(
+                        key=key,
+                        model=model,
+                        response=response,
+                        expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to write LLM cache")
+
+
+async def cleanup_llm_cache(session: AsyncSession) -> None:
+    now = datetime.now(timezone.utc)
+    await session.execute(delete(LlmCacheEntry).where(LlmCacheEntry.expires_at < now))
+
+
+llm_response_cache = LlmResponseCache()
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.llm_lease import LlmLease
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+_LEASE_LOCK_KEY = 0x4C4C4D
+# Waiting leases heartbeat every poll; one left by a killed process expires after a few polls.
+_WAITING_LEASE_POLLS = 10
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Requests default to interactive; background workers (the processing
+# pipeline) switch their task context to BACKGROUND.
+llm_priority: ContextVar[int] = ContextVar("llm_priority", default=INTERACTIVE)
+
+
+def _lease_expiry(active: bool = True) -> datetime:
+    if active:
+        ttl = settings.llm_governor_lease_seconds
+    else:
+        ttl = _WAITING_LEASE_POLLS * settings.llm_governor_poll_ms / 1000
+    return datetime.now(timezone.utc) + timedelta(seconds=ttl)
+
+
+class LlmGovernor:
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        background_concurrency: int | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_concurrency = max_concurrency
+        self._background_concurrency = background_concurrency
+        self._active = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wait_totals = {INTERACTIVE: [0.0, 0], BACKGROUND: [0.0, 0]}
+
+    def _limits(self) -> tuple[int, int]:
+        total = max(1, self._max_concurrency or settings.llm_max_concurrency)
+        background = self._background_concurrency or settings.llm_background_concurrency
+        return total, max(1, min(total, background))
+
+    def _can_start(self, priority: int) -> bool:
+        total, background = self._limits()
+        if sum(self._active.values()) >= total:
+            return False
+        return priority == INTERACTIVE or self._active[BACKGROUND] < background
+
+    def _has_waiters_ahead(self, priority: int) -> bool:
+        return any(
+            waiter_priority <= priority and not future.done()
+            for waiter_priority, _, future in self._waiters
+        )
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_start(priority):
+                break
+            heapq.heappop(self._waiters)
+            self._active[priority] += 1
+            future.set_result(None)
+
+    def _release(self, priority: int) -> None:
+        self._active[priority] -= 1
+        self._dispatch()
+
+    async def _try_activate(self, lease_id: int, priority: int) -> bool:
+        total, background = self._limits()
+        async with self._session_factory() as session:
+            if session.bind.dialect.name == "postgresql":
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LEASE_LOCK_KEY}
+                )
+            await session.execute(
+                delete(LlmLease).where(LlmLease.expires_at < datetime.now(timezone.utc))
+            )
+            leases = (
+                await session.execute(select(LlmLease.id, LlmLease.priority, LlmLease.active))
+            ).all()
+            if all(lease.id != lease_id for lease in leases):
+                session.add(
+                    LlmLease(
+                        id=lease_id, priority=priority, active=False, expires_at=_lease_expiry(False)
+                    )
+                )
+            active = [lease for lease in leases if lease.active]
+            waiting_ahead = any(
+                not lease.active and (lease.priority, lease.id) < (priority, lease_id)
+                for lease in leases
+            )
+            can_start = (
+                not waiting_ahead
+                and len(active) < total
+                and (
+                    priority == INTERACTIVE
+                    or sum(lease.priority == BACKGROUND for lease in active) < background
+                )
+            )
+            await session.execute(
+                update(LlmLease)
+                .where(LlmLease.id == lease_id)
+                .values(active=can_start, expires_at=_lease_expiry(can_start))
+            )
+            await session.commit()
+        return can_start
+
+    async def _release_lease(self, lease_id: int) -> None:
+        try:
+            async with self._session_factory() as session:
+                await session.execute(delete(LlmLease).where(LlmLease.id == lease_id))
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to release LLM lease %s", lease_id)
+
+    async def _acquire_lease(self, priority: int) -> int | None:
+        # Leases in the shared table let the API and bot processes respect one limit and one queue.
+        try:
+            async with self._session_factory() as session:
+                lease = LlmLease(priority=priority, active=False, expires_at=_lease_expiry(False))
+                session.add(lease)
+                await session.commit()
+                lease_id = lease.id
+        except Exception:
+            logger.exception("Shared LLM governor unavailable, using the local limit only")
+            return None
+        try:
+            while not await self._try_activate(lease_id, priority):
+                await asyncio.sleep(settings.llm_governor_poll_ms / 1000)
+        except Exception:
+            logger.exception("Shared LLM governor failed while waiting, using the local limit only")
+            await asyncio.shield(self._release_lease(lease_id))
+            return None
+        except BaseException:
+            await asyncio.shield(self._release_lease(lease_id))
+            raise
+        return lease_id
+
+    @asynccontextmanager
+    async def slot(self, priority: int | None = None) -> AsyncIterator[None]:
+        if priority is None:
+            priority = llm_priority.get()
+        started = time.monotonic()
+        if not self._has_waiters_ahead(priority) and self._can_start(priority):
+            self._active[priority] += 1
+        else:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release(priority)
+                raise
+        lease_id: int | None = None
+        try:
+            if self._session_factory is not None:
+                lease_id = await self._acquire_lease(priority)
+            totals = self._wait_totals[priority]
+            totals[0] += time.monotonic() - started
+            totals[1] += 1
+            yield
+        finally:
+            if lease_id is not None:
+                await asyncio.shield(self._release_lease(lease_id))
+            self._release(priority)
+
+    def queue_depths(self) -> dict[str, int]:
+        depths = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                depths[PRIORITY_NAMES[priority]] += 1
+        return depths
+
+    def drain_wait_stats(self) -> dict[str, tuple[int, float]]:
+        stats: dict[str, tuple[int, float]] = {}
+        for priority, totals in self._wait_totals.items():
+            waited, count = totals
+            stats[PRIORITY_NAMES[priority]] = (count, waited / count * 1000 if count else 0.0)
+            totals[0], totals[1] = 0.0, 0
+        return stats
+
+
+llm_governor = LlmGovernor(
+    session_factory=SessionLocal if settings.llm_governor_shared else None
+)
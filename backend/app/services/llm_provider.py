@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
 from app.core.config import get_settings
+from app.services.llm_cache import llm_response_cache
+from app.services.llm_governor import llm_governor
 
 settings = get_settings()
+_client: httpx.AsyncClient | None = None
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
 
 
 class LlmProviderError(Exception):
@@ -22,7 +33,9 @@ class LlmProvider:
     model: str
     api_key: str | None = None
 
-    async def chat(self, messages: list[dict[str, str]]) -> str:
+    def _request(
+        self, messages: list[dict[str, str]], stream: bool = False
+    ) -> tuple[str, dict[str, Any], dict[str, str]]:
         url = self.base_url.rstrip("/") + "/v1/chat/completions"
         headers: dict[str, str] = {}
         if self.api_key:
@@ -32,10 +45,26 @@ class LlmProvider:
             "messages": messages,
             "temperature": 0.2,
         }
-        async with httpx.AsyncClient(timeout=settings.litellm_timeout_seconds) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+        if stream:
+            payload["stream"] = True
+        return url, payload, headers
+
+    async def chat(self, messages: list[dict[str, str]]) -> str:
+        cached = await llm_response_cache.get(self.model, messages)
+        if cached is not None:
+            return cached
+        async with llm_governor.slot():
+            content = await self._chat(messages)
+        await llm_response_cache.set(self.model, messages, content)
+        return content
+
+    async def _chat(self, messages: list[dict[str, str]]) -> str:
+        url, payload, headers = self._request(messages)
+        response = await get_llm_http_client().post(
+            url, json=payload, headers=headers, timeout=settings.litellm_timeout_seconds
+        )
+        response.raise_for_status()
+        data = response.json()
         try:
             return data["choices"][0]["message"]["content"]
         except (KeyError, IndexError, TypeError) as exc:
@@ -43,6 +72,63 @@ class LlmProvider:
                 "Invalid LLM response: missing choices[0].message.content."
             ) from exc
 
+    async def chat_stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        cached = await llm_response_cache.get(self.model, messages)
+        if cached is not None:
+            yield cached
+            return
+        chunks: list[str] = []
+        async with llm_governor.slot():
+            async for content in self._chat_stream(messages):
+                chunks.append(content)
+                yield content
+        await llm_response_cache.set(self.model, messages, "".join(chunks))
+
+    async def _chat_stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        url, payload, headers = self._request(messages, stream=True)
+        try:
+            async with get_llm_http_client().stream(
+                "POST", url, json=payload, headers=headers, timeout=settings.litellm_timeout_seconds
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        choices = json.loads(data).get("choices") or []
+                        content = choices[0].get("delta", {}).get("content") if choices else None
+                    except (json.JSONDecodeError, AttributeError) as exc:
+                        raise LlmProviderError("Invalid LLM stream chunk.") from exc
+                    if content:
+                        yield content
+        except httpx.HTTPError as exc:
+            raise LlmProviderError(f"LLM stream failed: {exc}") from exc
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=settings.litellm_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.litellm_max_connections,
+                max_keepalive_connections=settings.litellm_max_connections,
+                keepalive_expiry=settings.litellm_keepalive_seconds,
+            ),
+            http2=settings.litellm_http2 and _HTTP2_AVAILABLE,
+        )
+    return _client
+
+
+async def close_llm_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 def get_llm_provider() -> LlmProvider | None:
     if not settings.litellm_url:
@@ -10,10 +10,31 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
 from app.db.session import SessionLocal
 from app.models.metric import Metric
+from app.services.llm_cache import cleanup_llm_cache, llm_response_cache
+from app.services.llm_governor import llm_governor
+from app.services.websearch import cleanup_web_search_cache
 
 settings = get_settings()
 
 
+def collect_llm_metrics(process: str) -> list[Metric]:
+    # Every process that calls the LLM (API, bot) reports its own cache and queue stats.
+    labels = {"process": process}
+    cache_hits, cache_misses = llm_response_cache.drain_stats()
+    metrics = [
+        Metric(name="llm.cache_hits", value=float(cache_hits), labels=labels),
+        Metric(name="llm.cache_misses", value=float(cache_misses), labels=labels),
+    ]
+    queue_depths = llm_governor.queue_depths()
+    for priority, (requests, wait_ms) in llm_governor.drain_wait_stats().items():
+        priority_labels = {**labels, "priority": priority}
+        depth = float(queue_depths[priority])
+        metrics.append(Metric(name="llm.queue_depth", value=depth, labels=priority_labels))
+        metrics.append(Metric(name="llm.requests", value=float(requests), labels=priority_labels))
+        metrics.append(Metric(name="llm.wait_ms_avg", value=wait_ms, labels=priority_labels))
+    return metrics
+
+
 async def collect_metrics(session: AsyncSession) -> None:
     cpu_percent = psutil.cpu_percent(interval=None)
     load_1, load_5, load_15 = psutil.getloadavg()
@@ -34,6 +55,8 @@ async def collect_metrics(session: AsyncSession) -> None:
         Metric(name="system.net_tx", value=float(net.bytes_sent), labels=None),
     ]
 
+    metrics.extend(collect_llm_metrics("api"))
+
     result = await session.execute(text("SELECT pg_database_size(current_database())"))
     db_size = result.scalar() or 0
     metrics.append(Metric(name="db.postgres_db_size_mb", value=float(db_size) / 1024 / 1024, labels=None))
@@ -54,6 +77,8 @@ async def metrics_loop(stop_event: asyncio.Event) -> None:
                 await collect_metrics(session)
                 if datetime.now(timezone.utc) >= next_cleanup:
                     await cleanup_metrics(session)
+                    await cleanup_llm_cache(session)
+                    await cleanup_web_search_cache(session)
                     next_cleanup = datetime.now(timezone.utc) + timedelta(days=1)
                 await session.commit()
             except Exception:
@@ -62,3 +87,19 @@ async def metrics_loop(stop_event: asyncio.Event) -> None:
             await asyncio.wait_for(stop_event.wait(), timeout=settings.metrics_interval_seconds)
         except asyncio.TimeoutError:
             continue
+
+
+async def process_metrics_loop(stop_event: asyncio.Event, process: str) -> None:
+    while True:
+        async with SessionLocal() as session:
+            try:
+                session.add_all(collect_llm_metrics(process))
+                await session.commit()
+            except Exception:
+                await session.rollback()
+        if stop_event.is_set():
+            return
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.metrics_interval_seconds)
+        except asyncio.TimeoutError:
+            continue
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import deque
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.item import Item
+
+settings = get_settings()
+_TOKEN_RE = re.compile(r"\w+")
+_MIN_TOKENS = 8
+_HASH_BITS = 64
+_BAND_BITS = 8
+_BAND_COUNT = _HASH_BITS // _BAND_BITS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_UNSIGNED_MASK = (1 << _HASH_BITS) - 1
+_PENDING_KEY = "near_duplicate_pending"
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << _HASH_BITS) if value >= 1 << (_HASH_BITS - 1) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value & _UNSIGNED_MASK
+
+
+def _distance(left: int, right: int) -> int:
+    return (_to_unsigned(left) ^ _to_unsigned(right)).bit_count()
+
+
+def _item_timestamp(published_at: datetime | None) -> float:
+    if published_at is None:
+        return time.time()
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return published_at.timestamp()
+
+
+# Only recent items count: a recurring templated post must not match last week's edition.
+def _within_window(left: float, right: float) -> bool:
+    return abs(left - right) <= settings.near_duplicate_window_hours * 3600
+
+
+def compute_simhash(text: str) -> int | None:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < _MIN_TOKENS:
+        return None
+    weights = [0] * _HASH_BITS
+    for token in tokens:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(_HASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return _to_signed(fingerprint)
+
+
+def _bands(fingerprint: int) -> list[tuple[int, int]]:
+    value = _to_unsigned(fingerprint)
+    return [(band, value >> (band * _BAND_BITS) & _BAND_MASK) for band in range(_BAND_COUNT)]
+
+
+class SimHashIndex:
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[int, int, float]] = {}
+        self._order: deque[int] = deque()
+        self._buckets: dict[tuple[int, int], set[int]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._order.clear()
+        self._buckets.clear()
+        self._loaded = False
+
+    def match(
+        self, fingerprint: int, exclude: int | None = None, timestamp: float | None = None
+    ) -> int | None:
+        if timestamp is None:
+            timestamp = time.time()
+        max_distance = settings.near_duplicate_max_distance
+        best: tuple[int, int] | None = None
+        candidates: set[int] = set()
+        for band in _bands(fingerprint):
+            candidates.update(self._buckets.get(band, ()))
+        candidates.discard(exclude)
+        for item_id in candidates:
+            stored, cluster_id, stored_at = self._entries[item_id]
+            if not _within_window(timestamp, stored_at):
+                continue
+            distance = _distance(fingerprint, stored)
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, cluster_id)
+        return best[1] if best else None
+
+    def add(
+        self, item_id: int, fingerprint: int, cluster_id: int, timestamp: float | None = None
+    ) -> None:
+        entry = (fingerprint, cluster_id, time.time() if timestamp is None else timestamp)
+        if item_id in self._entries:
+            self._entries[item_id] = entry
+            return
+        self._entries[item_id] = entry
+        self._order.append(item_id)
+        for band in _bands(fingerprint):
+            self._buckets.setdefault(band, set()).add(item_id)
+        while len(self._order) > max(1, settings.near_duplicate_index_size):
+            self._evict(self._order.popleft())
+
+    def _evict(self, item_id: int) -> None:
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        for band in _bands(entry[0]):
+            bucket = self._buckets.get(band)
+            if bucket is None:
+                continue
+            bucket.discard(item_id)
+            if not bucket:
+                self._buckets.pop(band, None)
+
+    async def ensure_loaded(self, session: AsyncSession, before_id: int | None = None) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            published_at = func.coalesce(Item.published_at, Item.created_at)
+            since = datetime.now(timezone.utc) - timedelta(hours=settings.near_duplicate_window_hours)
+            stmt = select(Item.id, Item.simhash, Item.cluster_id, published_at).where(
+                Item.simhash.is_not(None), published_at >= since
+            )
+            if before_id is not None:
+                stmt = stmt.where(Item.id < before_id)
+            result = await session.execute(
+                stmt.order_by(Item.id.desc()).limit(settings.near_duplicate_index_size)
+            )
+            for item_id, fingerprint, cluster_id, published in reversed(result.all()):
+                self.add(item_id, fingerprint, cluster_id or item_id, _item_timestamp(published))
+            self._loaded = True
+
+
+near_duplicate_index = SimHashIndex()
+
+
+# Fingerprints become visible to other sessions only once their rows are committed.
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for item_id, fingerprint, cluster_id, timestamp in session.info.pop(_PENDING_KEY, ()):
+        near_duplicate_index.add(item_id, fingerprint, cluster_id, timestamp)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _match_pending(
+    pending: list[tuple[int, int, int, float]], fingerprint: int, timestamp: float
+) -> int | None:
+    max_distance = settings.near_duplicate_max_distance
+    best: tuple[int, int] | None = None
+    for _, stored, cluster_id, stored_at in pending:
+        if not _within_window(timestamp, stored_at):
+            continue
+        distance = _distance(fingerprint, stored)
+        if distance <= max_distance and (best is None or distance < best[0]):
+            best = (distance, cluster_id)
+    return best[1] if best else None
+
+
+async def assign_clusters(session: AsyncSession, items: list[Item]) -> None:
+    fingerprinted = [item for item in items if item.simhash is not None]
+    if not fingerprinted:
+        return
+    fingerprinted.sort(key=lambda item: item.id)
+    await near_duplicate_index.ensure_loaded(session, before_id=fingerprinted[0].id)
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for item in fingerprinted:
+        timestamp = _item_timestamp(item.published_at)
+        cluster_id = near_duplicate_index.match(item.simhash, exclude=item.id, timestamp=timestamp)
+        if cluster_id is None:
+            cluster_id = _match_pending(pending, item.simhash, timestamp)
+        if cluster_id is not None and cluster_id != item.id:
+            item.cluster_id = cluster_id
+        pending.append((item.id, item.simhash, item.cluster_id or item.id, timestamp))
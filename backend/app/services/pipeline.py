@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal, release_connection
+from app.models.item import Item
+from app.models.source import Source
+from app.services.autotagging import assign_topics
+from app.services.deepdive import deepdive_wanted, precompute_deepdive
+from app.services.delivery import enqueue_instant_delivery
+from app.services.llm_governor import BACKGROUND, llm_priority
+from app.services.sentinel import apply_sentinel
+from app.services.source_reputation import source_reputation
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PIPELINE_ENTRY_STAGE = "tag"
+_NEXT_STAGE: dict[str, str | None] = {
+    "tag": "verify",
+    "verify": "deliver",
+    "deliver": "deepdive",
+    "deepdive": None,
+}
+_UNVERIFIED_STAGES = ("tag", "verify")
+
+
+async def _tag(session: AsyncSession, item: Item) -> None:
+    await assign_topics(session, item)
+
+
+async def _verify(session: AsyncSession, item: Item) -> None:
+    source = await session.get(Source, item.source_id)
+    reputation = await source_reputation.get(session, source)
+    await release_connection(session)
+    await apply_sentinel(item, source, reputation)
+    await source_reputation.record_outcome(session, item.source_id, item.sentinel_json)
+
+
+async def _deliver(session: AsyncSession, item: Item) -> None:
+    await enqueue_instant_delivery(session, item)
+
+
+async def _deepdive(session: AsyncSession, item: Item) -> None:
+    await precompute_deepdive(session, item)
+
+
+def _absorb_duplicate(item: Item, canonical: Item | None) -> None:
+    if canonical:
+        item.impact = canonical.impact
+        item.trust_score = canonical.trust_score
+        item.trust_status = canonical.trust_status
+    item.sentinel_json = {"duplicate_of": item.cluster_id}
+
+
+_HANDLERS = {
+    "tag": _tag,
+    "verify": _verify,
+    "deliver": _deliver,
+    "deepdive": _deepdive,
+}
+
+
+def _next_stage(stage: str, item: Item) -> str | None:
+    next_stage = _NEXT_STAGE[stage]
+    if next_stage == "deepdive" and not deepdive_wanted(item):
+        return None
+    return next_stage
+
+
+def _stage_workers(stage: str) -> int:
+    workers = {
+        "tag": settings.pipeline_tag_workers,
+        "verify": settings.pipeline_verify_workers,
+        "deliver": settings.pipeline_deliver_workers,
+        "deepdive": settings.pipeline_deepdive_workers,
+    }
+    return max(1, workers[stage])
+
+
+class ProcessingPipeline:
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] = SessionLocal
+    ) -> None:
+        self._session_factory = session_factory
+        queue_size = max(1, settings.pipeline_queue_size)
+        self._queues: dict[str, asyncio.Queue[int]] = {
+            stage: asyncio.Queue(maxsize=queue_size) for stage in _HANDLERS
+        }
+        self._claimed: dict[str, set[int]] = {stage: set() for stage in _HANDLERS}
+
+    async def _pending_ids(self, stage: str) -> list[int]:
+        claimed = self._claimed[stage]
+        limit = self._queues[stage].maxsize + len(claimed)
+        canonical = aliased(Item)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Item.id)
+                .outerjoin(canonical, canonical.id == Item.cluster_id)
+                .where(
+                    Item.pipeline_stage == stage,
+                    # Duplicates wait until their canonical item has been verified.
+                    or_(
+                        Item.cluster_id.is_(None),
+                        canonical.pipeline_stage.is_(None),
+                        canonical.pipeline_stage.not_in(_UNVERIFIED_STAGES),
+                    ),
+                )
+                .order_by(Item.id)
+                .limit(limit)
+            )
+            return [item_id for item_id in result.scalars().all() if item_id not in claimed]
+
+    async def _feed(self, stage: str, stop_event: asyncio.Event) -> None:
+        queue = self._queues[stage]
+        while not stop_event.is_set():
+            try:
+                pending = await self._pending_ids(stage)
+            except Exception:
+                logger.exception("Failed to load pipeline items for stage %s", stage)
+                pending = []
+            for item_id in pending:
+                self._claimed[stage].add(item_id)
+                await queue.put(item_id)
+            if pending:
+                continue
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=settings.pipeline_poll_seconds)
+            except asyncio.TimeoutError:
+                continue
+
+    async def process(self, stage: str, item_id: int) -> None:
+        async with self._session_factory() as session:
+            item = await session.get(Item, item_id)
+            if not item or item.pipeline_stage != stage:
+                return
+            if item.cluster_id is not None:
+                canonical = await session.get(Item, item.cluster_id)
+                if canonical and canonical.pipeline_stage in _UNVERIFIED_STAGES:
+                    return
+                _absorb_duplicate(item, canonical)
+                item.pipeline_stage = None
+                await session.commit()
+                return
+            try:
+                await _HANDLERS[stage](session, item)
+            except Exception:
+                logger.exception("Pipeline stage %s failed for item %s", stage, item_id)
+                await session.rollback()
+                item = await session.get(Item, item_id)
+                if not item:
+                    return
+            item.pipeline_stage = _next_stage(stage, item)
+            await session.commit()
+
+    async def _work(self, stage: str) -> None:
+        llm_priority.set(BACKGROUND)
+        queue = self._queues[stage]
+        while True:
+            item_id = await queue.get()
+            try:
+                await self.process(stage, item_id)
+            except Exception:
+                logger.exception("Pipeline worker failed for item %s", item_id)
+            finally:
+                self._claimed[stage].discard(item_id)
+                queue.task_done()
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        tasks: list[asyncio.Task] = []
+        for stage in _HANDLERS:
+            tasks.append(asyncio.create_task(self._feed(stage, stop_event)))
+            for _ in range(_stage_workers(stage)):
+                tasks.append(asyncio.create_task(self._work(stage)))
+        try:
+            await stop_event.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def pipeline_loop(stop_event: asyncio.Event) -> None:
+    await ProcessingPipeline().run(stop_event)
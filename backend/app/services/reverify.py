@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import bindparam, case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.item import Item
+from app.models.source import Source
+from app.services.cross_check import cross_check_coordinator
+from app.services.sentinel import next_reverify_at, run_sentinel
+from app.services.source_reputation import source_reputation
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+_IMPACT_ORDER = case((Item.impact == "high", 0), (Item.impact == "medium", 1), else_=2)
+_items = Item.__table__
+_SYNC_DUPLICATES = (
+    update(_items)
+    .where(_items.c.cluster_id == bindparam("canonical_id"))
+    .values(
+        trust_score=bindparam("canonical_trust_score"),
+        trust_status=bindparam("canonical_trust_status"),
+        impact=bindparam("canonical_impact"),
+    )
+)
+
+
+async def _reserve_free_search() -> bool:
+    while (delay := cross_check_coordinator.idle_delay()) is not None:
+        if cross_check_coordinator.try_reserve_idle_slot():
+            return True
+        await asyncio.sleep(delay)
+    return False
+
+
+async def reverify_errored_items(session: AsyncSession) -> int:
+    now = datetime.now(timezone.utc)
+    items = (
+        await session.execute(
+            select(Item)
+            .where(Item.reverify_at.is_not(None), Item.reverify_at <= now)
+            .order_by(_IMPACT_ORDER, Item.created_at, Item.id)
+            .limit(max(1, settings.sentinel_reverify_batch_size))
+        )
+    ).scalars().all()
+
+    rows: list[dict[str, Any]] = []
+    for item in items:
+        if not await _reserve_free_search():
+            break
+        source = await session.get(Source, item.source_id)
+        reputation = await source_reputation.get(session, source)
+        result = await run_sentinel(item, source, reputation=reputation)
+        previous = (item.sentinel_json or {}).get("cross_check") or {}
+        cross_check = result.artifacts["cross_check"]
+        attempts = int(previous.get("attempts", 0)) + 1
+        cross_check["attempts"] = attempts
+        rows.append(
+            {
+                "id": item.id,
+                "trust_score": result.trust_score,
+                "trust_status": result.trust_status,
+                "impact": result.impact,
+                "sentinel_json": result.artifacts,
+                "reverify_at": next_reverify_at(cross_check, attempts),
+            }
+        )
+        if cross_check["status"] == "error":
+            # Search is still failing: back off instead of burning the rest of the batch.
+            break
+        await source_reputation.record_outcome(
+            session, item.source_id, {"cross_check": cross_check}, reverified=True
+        )
+
+    if rows:
+        await session.execute(update(Item), rows)
+        await session.execute(
+            _SYNC_DUPLICATES,
+            [
+                {
+                    "canonical_id": row["id"],
+                    "canonical_trust_score": row["trust_score"],
+                    "canonical_trust_status": row["trust_status"],
+                    "canonical_impact": row["impact"],
+                }
+                for row in rows
+            ],
+        )
+    return len(rows)
+
+
+async def reverify_loop(
+    stop_event: asyncio.Event, session_factory: async_sessionmaker[AsyncSession] = SessionLocal
+) -> None:
+    while not stop_event.is_set():
+        async with session_factory() as session:
+            try:
+                await reverify_errored_items(session)
+                await session.commit()
+            except Exception:
+                logger.exception("Sentinel re-verification failed")
+                await session.rollback()
+        try:
+            await asyncio.wait_for(
+                stop_event.wait(), timeout=settings.sentinel_reverify_interval_seconds
+            )
+        except asyncio.TimeoutError:
+            continue
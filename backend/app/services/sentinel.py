@@ -1,28 +1,24 @@
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from app.core.config import get_settings
 from app.models.item import Item
 from app.models.source import Source
-from app.services.websearch import WebSearchError, web_search_client
+from app.services.cross_check import cross_check_coordinator
+from app.services.sentinel_analysis import TextAnalysis, sentinel_analyzer
+from app.services.source_reputation import SourceReputationView
+from app.services.websearch import WebSearchError
 
-_HYPE_MARKERS = ("шок", "сенсация", "breaking", "немыслимо", "скандал", "слух")
-_IMPACT_MARKERS = ("миллиард", "санкции", "банкрот", "поглощение", "ipo", "acquisition")
+settings = get_settings()
 _MAX_QUERY_LENGTH = 120
 _MAX_CROSS_CHECK_MATCHES = 5
-_ENTITY_PATTERN = re.compile(r"\b[А-ЯA-Z][\w-]{2,}\b")
-_MAX_ENTITIES = 10
 _HIGH_IMPACT_TEXT_LENGTH = 800
 _MEDIUM_IMPACT_TEXT_LENGTH = 250
-_HYPE_PATTERN = re.compile(
-    r"\b(" + "|".join(re.escape(marker) for marker in _HYPE_MARKERS) + r")\b"
-)
-_IMPACT_PATTERN = re.compile(
-    r"\b(" + "|".join(re.escape(marker) for marker in _IMPACT_MARKERS) + r")\b"
-)
+_CROSS_CHECK_OK_DELTA = 10
+_CROSS_CHECK_MISSING_DELTA = -5
 
 
 @dataclass
@@ -33,7 +29,9 @@ class SentinelArtifacts:
     artifacts: dict[str, Any]
 
 
-async def _run_cross_check(item: Item) -> dict[str, Any]:
+async def _run_cross_check(
+    item: Item, reputation: SourceReputationView | None = None, decisive: bool = True
+) -> dict[str, Any]:
     text = item.text or ""
     query = item.title.strip() or text[:_MAX_QUERY_LENGTH]
     result: dict[str, Any] = {
@@ -44,8 +42,16 @@ async def _run_cross_check(item: Item) -> dict[str, Any]:
     }
     if not query:
         return result
+    if reputation is not None and reputation.trusted:
+        result["status"] = "skipped"
+        result["reason"] = "trusted_source"
+        return result
+    if not decisive:
+        result["status"] = "skipped"
+        result["reason"] = "not_decisive"
+        return result
     try:
-        matches = await web_search_client.search(query)
+        matches = await cross_check_coordinator.search(query)
     except WebSearchError as exc:
         result["status"] = "error"
         result["error"] = exc.message
@@ -59,66 +65,110 @@ async def _run_cross_check(item: Item) -> dict[str, Any]:
     return {"status": status, "matches": sample, "query": query}
 
 
-def _run_logic_audit(text: str) -> dict[str, Any]:
-    flags = sorted(set(_HYPE_PATTERN.findall(text)))
+def _run_logic_audit(analysis: TextAnalysis) -> dict[str, Any]:
+    flags = list(analysis.hype_flags)
     status = "warning" if flags else "ok"
     return {"status": status, "flags": flags}
 
 
-def _run_entity_verify(text: str) -> dict[str, Any]:
-    candidates = set(_ENTITY_PATTERN.findall(text))
-    entities = sorted(candidates)[:_MAX_ENTITIES]
+def _run_entity_verify(analysis: TextAnalysis) -> dict[str, Any]:
+    entities = list(analysis.entities)
     status = "ok" if entities else "limited"
     return {"status": status, "entities": entities}
 
 
-def _run_trust_ledger(
+def _local_score(
     source: Source | None,
-    cross_check: dict[str, Any],
     logic_audit: dict[str, Any],
     entity_verify: dict[str, Any],
-    item_text: str,
-) -> dict[str, Any]:
-    score = source.trust_manual if source else 50
-    if cross_check.get("status") == "ok":
-        score += 10
-    elif cross_check.get("status") == "missing":
-        score -= 5
+    reputation: SourceReputationView | None = None,
+) -> int:
+    if reputation is not None:
+        score = reputation.score
+    else:
+        score = source.trust_manual if source else 50
     if logic_audit.get("status") == "warning":
         score -= 10
     if entity_verify.get("status") == "ok":
         score += 5
-    score = max(0, min(100, int(score)))
+    return int(score)
+
 
+def _cross_check_delta(status: str | None) -> int:
+    if status == "ok":
+        return _CROSS_CHECK_OK_DELTA
+    if status == "missing":
+        return _CROSS_CHECK_MISSING_DELTA
+    return 0
+
+
+def _clamp_score(score: int) -> int:
+    return max(0, min(100, int(score)))
+
+
+def _trust_status(score: int) -> str:
     if score >= 80:
-        trust_status = "confirmed"
-    elif score >= 55:
-        trust_status = "mixed"
-    elif score >= 30:
-        trust_status = "unclear"
-    else:
-        trust_status = "hype"
+        return "confirmed"
+    if score >= 55:
+        return "mixed"
+    if score >= 30:
+        return "unclear"
+    return "hype"
+
+
+def _cross_check_is_decisive(local_score: int) -> bool:
+    # The web tier only matters when its best and worst outcomes land in different buckets.
+    best = _trust_status(_clamp_score(local_score + _CROSS_CHECK_OK_DELTA))
+    worst = _trust_status(_clamp_score(local_score + _CROSS_CHECK_MISSING_DELTA))
+    return best != worst
+
 
-    has_impact_marker = bool(_IMPACT_PATTERN.search(item_text))
-    is_long_text = len(item_text) > _HIGH_IMPACT_TEXT_LENGTH
-    if has_impact_marker or is_long_text:
+def _run_trust_ledger(
+    source: Source | None,
+    cross_check: dict[str, Any],
+    logic_audit: dict[str, Any],
+    entity_verify: dict[str, Any],
+    analysis: TextAnalysis,
+    reputation: SourceReputationView | None = None,
+) -> dict[str, Any]:
+    score = _local_score(source, logic_audit, entity_verify, reputation)
+    score = _clamp_score(score + _cross_check_delta(cross_check.get("status")))
+
+    is_long_text = analysis.text_length > _HIGH_IMPACT_TEXT_LENGTH
+    if analysis.has_impact_marker or is_long_text:
         impact = "high"
-    elif len(item_text) > _MEDIUM_IMPACT_TEXT_LENGTH:
+    elif analysis.text_length > _MEDIUM_IMPACT_TEXT_LENGTH:
         impact = "medium"
     else:
         impact = "low"
 
-    return {"trust_score": score, "trust_status": trust_status, "impact": impact}
+    ledger = {"trust_score": score, "trust_status": _trust_status(score), "impact": impact}
+    if reputation is not None:
+        ledger["source_reputation"] = reputation.score
+    return ledger
+
 
+def sentinel_text(item: Item) -> str:
+    return f"{item.title} {item.text or ''}"
 
-async def run_sentinel(item: Item, source: Source | None) -> SentinelArtifacts:
-    raw_text = f"{item.title} {item.text or ''}"
-    normalized_text = raw_text.lower()
-    cross_check = await _run_cross_check(item)
-    logic_audit = _run_logic_audit(normalized_text)
-    entity_verify = _run_entity_verify(raw_text)
+
+async def run_sentinel(
+    item: Item,
+    source: Source | None,
+    analysis: TextAnalysis | None = None,
+    reputation: SourceReputationView | None = None,
+) -> SentinelArtifacts:
+    if analysis is None:
+        analysis = await sentinel_analyzer.analyze(sentinel_text(item))
+    logic_audit = _run_logic_audit(analysis)
+    entity_verify = _run_entity_verify(analysis)
+    decisive = _cross_check_is_decisive(
+        _local_score(source, logic_audit, entity_verify, reputation)
+    )
+    cross_check = await _run_cross_check(item, reputation, decisive)
+    decided_by = "web" if cross_check["status"] in {"ok", "missing"} else "local"
     trust_ledger = _run_trust_ledger(
-        source, cross_check, logic_audit, entity_verify, normalized_text
+        source, cross_check, logic_audit, entity_verify, analysis, reputation
     )
     artifacts = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -126,6 +176,7 @@ async def run_sentinel(item: Item, source: Source | None) -> SentinelArtifacts:
         "logic_audit": logic_audit,
         "entity_verify": entity_verify,
         "trust_ledger": trust_ledger,
+        "decided_by": decided_by,
     }
     return SentinelArtifacts(
         trust_score=trust_ledger["trust_score"],
@@ -135,10 +186,23 @@ async def run_sentinel(item: Item, source: Source | None) -> SentinelArtifacts:
     )
 
 
-async def apply_sentinel(item: Item, source: Source | None) -> dict[str, Any]:
-    result = await run_sentinel(item, source)
+def next_reverify_at(cross_check: dict[str, Any], attempts: int = 0) -> datetime | None:
+    if cross_check.get("status") != "error" or attempts >= settings.sentinel_reverify_max_attempts:
+        return None
+    delay = settings.sentinel_reverify_delay_seconds * 2**attempts
+    return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+
+def _apply_result(item: Item, result: SentinelArtifacts) -> dict[str, Any]:
     item.trust_score = result.trust_score
     item.trust_status = result.trust_status
     item.impact = result.impact
     item.sentinel_json = result.artifacts
+    item.reverify_at = next_reverify_at(result.artifacts["cross_check"])
     return result.artifacts
+
+
+async def apply_sentinel(
+    item: Item, source: Source | None, reputation: SourceReputationView | None = None
+) -> dict[str, Any]:
+    return _apply_result(item, await run_sentinel(item, source, reputation=reputation))
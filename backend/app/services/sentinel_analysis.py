@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+from app.core.process_pool import run_in_process_pool
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+HYPE_MARKERS = frozenset(("шок", "сенсация", "breaking", "немыслимо", "скандал", "слух"))
+IMPACT_MARKERS = frozenset(("миллиард", "санкции", "банкрот", "поглощение", "ipo", "acquisition"))
+MAX_ENTITIES = 10
+_CHUNK_RE = re.compile(r"[\w-]+")
+_ENTITY_MIN_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class TextAnalysis:
+    hype_flags: tuple[str, ...]
+    has_impact_marker: bool
+    entities: tuple[str, ...]
+    text_length: int
+
+
+def _is_entity_initial(char: str) -> bool:
+    return "A" <= char <= "Z" or "А" <= char <= "Я"
+
+
+def _entity_candidate(chunk: str) -> str | None:
+    for index, char in enumerate(chunk):
+        if _is_entity_initial(char) and (index == 0 or chunk[index - 1] == "-"):
+            candidate = chunk[index:].rstrip("-")
+            if len(candidate) >= _ENTITY_MIN_LENGTH:
+                return candidate
+            return None
+    return None
+
+
+# One scan over the raw text collects hype markers, impact markers and entity
+# candidates; markers are single words, so they are looked up per hyphen part.
+def analyze_text(text: str) -> TextAnalysis:
+    hype: set[str] = set()
+    entities: set[str] = set()
+    has_impact_marker = False
+    for match in _CHUNK_RE.finditer(text):
+        chunk = match.group()
+        lowered = chunk.lower()
+        for part in lowered.split("-") if "-" in lowered else (lowered,):
+            if part in HYPE_MARKERS:
+                hype.add(part)
+            elif part in IMPACT_MARKERS:
+                has_impact_marker = True
+        entity = _entity_candidate(chunk)
+        if entity:
+            entities.add(entity)
+    return TextAnalysis(
+        hype_flags=tuple(sorted(hype)),
+        has_impact_marker=has_impact_marker,
+        entities=tuple(sorted(entities)[:MAX_ENTITIES]),
+        text_length=len(text),
+    )
+
+
+def analyze_texts(texts: list[str]) -> list[TextAnalysis]:
+    return [analyze_text(text) for text in texts]
+
+
+async def analyze_batch(texts: list[str]) -> list[TextAnalysis]:
+    if sum(len(text) for text in texts) >= settings.sentinel_process_threshold_chars:
+        return await run_in_process_pool(analyze_texts, texts)
+    return analyze_texts(texts)
+
+
+class SentinelAnalyzer:
+    def __init__(self) -> None:
+        self._pending: list[tuple[str, asyncio.Future[TextAnalysis]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def analyze(self, text: str) -> TextAnalysis:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[TextAnalysis] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= max(1, settings.sentinel_batch_size):
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(settings.sentinel_batch_window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._analyze_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _analyze_batch(self, batch: list[tuple[str, asyncio.Future[TextAnalysis]]]) -> None:
+        try:
+            results = await analyze_batch([text for text, _ in batch])
+        except Exception:
+            logger.exception("Sentinel analysis in the process pool failed, analyzing inline")
+            results = analyze_texts([text for text, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+sentinel_analyzer = SentinelAnalyzer()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import DateTime, event, extract, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.source import Source
+from app.models.source_reputation import SourceReputation
+
+settings = get_settings()
+_OUTCOME_WEIGHT = 20
+_FEEDBACK_WEIGHT = 10
+_PRIOR = 5.0
+_FIELDS = ("checked", "searched", "corroborated", "hype", "likes", "dislikes")
+_DIRTY_KEY = "source_reputation_dirty"
+_reputation = SourceReputation.__table__
+
+
+@dataclass
+class ReputationStats:
+    checked: float = 0.0
+    searched: float = 0.0
+    corroborated: float = 0.0
+    hype: float = 0.0
+    likes: float = 0.0
+    dislikes: float = 0.0
+    updated_at: float = 0.0
+
+    def decayed(self, now: float) -> ReputationStats:
+        half_life = settings.source_reputation_half_life_days * 86400
+        if not self.updated_at or half_life <= 0 or now <= self.updated_at:
+            return ReputationStats(*(getattr(self, field) for field in _FIELDS), updated_at=now)
+        factor = 0.5 ** ((now - self.updated_at) / half_life)
+        return ReputationStats(
+            *(getattr(self, field) * factor for field in _FIELDS), updated_at=now
+        )
+
+    def score(self, trust_manual: int) -> int:
+        # Corroboration only counts items that were searched; hype is a rate over every verified item.
+        outcome = self.corroborated / (self.searched + _PRIOR) - self.hype / (self.checked + _PRIOR)
+        feedback = (self.likes - self.dislikes) / (self.likes + self.dislikes + _PRIOR)
+        value = trust_manual + _OUTCOME_WEIGHT * outcome + _FEEDBACK_WEIGHT * feedback
+        return max(0, min(100, round(value)))
+
+
+@dataclass(frozen=True)
+class SourceReputationView:
+    score: int
+    checked: float
+
+    @property
+    def trusted(self) -> bool:
+        return (
+            self.score >= settings.source_trusted_score
+            and self.checked >= settings.source_trusted_min_checks
+        )
+
+
+def _timestamp(value: datetime | None) -> float:
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _decay_factor(dialect: str, now: datetime):
+    half_life = settings.source_reputation_half_life_days * 86400
+    if half_life <= 0:
+        return literal(1.0)
+    now_param = literal(now, DateTime(timezone=True))
+    if dialect == "postgresql":
+        elapsed = extract("epoch", now_param - _reputation.c.updated_at)
+        return func.power(0.5, func.greatest(elapsed, 0.0) / half_life)
+    elapsed = (func.julianday(now_param) - func.julianday(_reputation.c.updated_at)) * 86400
+    return func.power(0.5, func.max(elapsed, 0.0) / half_life)
+
+
+def _upsert_statement(dialect: str, source_id: int, deltas: dict[str, float], now: datetime):
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    greatest = func.greatest if dialect == "postgresql" else func.max
+    factor = _decay_factor(dialect, now)
+    stmt = insert(_reputation).values(
+        source_id=source_id,
+        updated_at=now,
+        **{field: max(0.0, deltas.get(field, 0.0)) for field in _FIELDS},
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[_reputation.c.source_id],
+        set_={
+            **{
+                field: greatest(_reputation.c[field] * factor + deltas.get(field, 0.0), 0.0)
+                for field in _FIELDS
+            },
+            "updated_at": now,
+        },
+    )
+
+
+class SourceReputationLedger:
+    def __init__(self) -> None:
+        self._cache: dict[int, tuple[float, ReputationStats]] = {}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def invalidate(self, source_id: int) -> None:
+        self._cache.pop(source_id, None)
+
+    async def _stats(self, session: AsyncSession, source_id: int) -> ReputationStats:
+        cached = self._cache.get(source_id)
+        if cached and time.monotonic() - cached[0] < settings.source_reputation_cache_seconds:
+            return cached[1]
+        row = (
+            await session.execute(
+                select(*(_reputation.c[field] for field in _FIELDS), _reputation.c.updated_at)
+                .where(_reputation.c.source_id == source_id)
+            )
+        ).first()
+        stats = ReputationStats()
+        if row is not None:
+            stats = ReputationStats(
+                *(getattr(row, field) or 0.0 for field in _FIELDS),
+                updated_at=_timestamp(row.updated_at),
+            )
+        self._cache[source_id] = (time.monotonic(), stats)
+        return stats
+
+    async def get(self, session: AsyncSession, source: Source | None) -> SourceReputationView | None:
+        if source is None:
+            return None
+        stats = (await self._stats(session, source.id)).decayed(time.time())
+        return SourceReputationView(score=stats.score(source.trust_manual), checked=stats.checked)
+
+    async def _update(self, session: AsyncSession, source_id: int, **deltas: float) -> None:
+        # Decay and increment happen in one upsert, so concurrent workers never lose updates.
+        now = datetime.now(timezone.utc)
+        await session.execute(_upsert_statement(session.bind.dialect.name, source_id, deltas, now))
+        session.info.setdefault(_DIRTY_KEY, set()).add((self, source_id))
+
+    async def record_outcome(
+        self,
+        session: AsyncSession,
+        source_id: int,
+        artifacts: dict[str, Any] | None,
+        reverified: bool = False,
+    ) -> None:
+        artifacts = artifacts or {}
+        cross_check = artifacts.get("cross_check") or {}
+        logic_audit = artifacts.get("logic_audit") or {}
+        # A re-verification only adds the search result; the item was already counted as checked.
+        deltas: dict[str, float] = {} if reverified else {"checked": 1.0}
+        if cross_check.get("status") in {"ok", "missing"}:
+            deltas["searched"] = 1.0
+            if cross_check["status"] == "ok":
+                deltas["corroborated"] = 1.0
+        if logic_audit.get("status") == "warning":
+            deltas["hype"] = 1.0
+        if deltas:
+            await self._update(session, source_id, **deltas)
+
+    async def record_feedback(
+        self, session: AsyncSession, source_id: int, previous_vote: str | None, vote: str | None
+    ) -> None:
+        if previous_vote == vote:
+            return
+        deltas: dict[str, float] = {}
+        for old_or_new, sign in ((previous_vote, -1.0), (vote, 1.0)):
+            if old_or_new == "like":
+                deltas["likes"] = deltas.get("likes", 0.0) + sign
+            elif old_or_new == "dislike":
+                deltas["dislikes"] = deltas.get("dislikes", 0.0) + sign
+        if deltas:
+            await self._update(session, source_id, **deltas)
+
+
+source_reputation = SourceReputationLedger()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for ledger, source_id in session.info.pop(_DIRTY_KEY, ()):
+        ledger.invalidate(source_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
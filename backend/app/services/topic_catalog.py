@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.topic import Topic
+from app.services.keyword_matcher import KeywordMatcher
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class CatalogTopic:
+    id: int
+    name: str
+    description: str | None
+    keywords: tuple[str, ...]
+    order: int | None
+
+
+@dataclass(frozen=True)
+class TopicSnapshot:
+    version: tuple[int, int | None, datetime | None]
+    topics: tuple[CatalogTopic, ...]
+    matcher: KeywordMatcher
+
+
+class TopicCatalog:
+    def __init__(self) -> None:
+        self._snapshot: TopicSnapshot | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    async def get(self, session: AsyncSession) -> TopicSnapshot:
+        snapshot = self._snapshot
+        if snapshot and time.monotonic() - self._checked_at < settings.topic_catalog_check_seconds:
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot and time.monotonic() - self._checked_at < settings.topic_catalog_check_seconds:
+                return snapshot
+            version = await self._version(session)
+            if snapshot is None or snapshot.version != version:
+                snapshot = await self._load(session, version)
+                self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+            return snapshot
+
+    async def _version(self, session: AsyncSession) -> tuple[int, int | None, datetime | None]:
+        result = await session.execute(
+            select(func.count(Topic.id), func.max(Topic.id), func.max(Topic.updated_at))
+        )
+        count, max_id, max_updated_at = result.one()
+        return count, max_id, max_updated_at
+
+    async def _load(
+        self, session: AsyncSession, version: tuple[int, int | None, datetime | None]
+    ) -> TopicSnapshot:
+        result = await session.execute(
+            select(Topic).order_by(Topic.order.is_(None), Topic.order, Topic.id)
+        )
+        topics = tuple(
+            CatalogTopic(
+                id=topic.id,
+                name=topic.name,
+                description=topic.description,
+                keywords=tuple(topic.keywords or ()),
+                order=topic.order,
+            )
+            for topic in result.scalars().all()
+        )
+        matcher = KeywordMatcher({topic.id: topic.keywords for topic in topics})
+        return TopicSnapshot(version=version, topics=topics, matcher=matcher)
+
+
+topic_catalog = TopicCatalog()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from app.core.config import get_settings
+from app.services.chroma import get_collection
+from app.services.topic_catalog import TopicSnapshot
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+_COLLECTION_NAME = "topics"
+_MAX_QUERY_TEXT_LENGTH = 2000
+
+
+def _topic_document(name: str, description: str | None, keywords: tuple[str, ...]) -> str:
+    parts = [name]
+    if description:
+        parts.append(description)
+    if keywords:
+        parts.append(", ".join(keywords))
+    return ". ".join(parts)
+
+
+class TopicVectorIndex:
+    def __init__(self, client: Any = None, embedding_function: Any = None) -> None:
+        self._client = client
+        self._embedding_function = embedding_function
+        self._collection: Any = None
+        self._synced_version: tuple | None = None
+        self._lock = asyncio.Lock()
+
+    def _get_collection(self) -> Any:
+        if self._collection is None:
+            self._collection = get_collection(
+                _COLLECTION_NAME, self._client, self._embedding_function
+            )
+        return self._collection
+
+    def _sync(self, catalog: TopicSnapshot) -> None:
+        collection = self._get_collection()
+        ids = [str(topic.id) for topic in catalog.topics]
+        stale = set(collection.get(include=[])["ids"]) - set(ids)
+        if stale:
+            collection.delete(ids=list(stale))
+        if ids:
+            collection.upsert(
+                ids=ids,
+                documents=[
+                    _topic_document(topic.name, topic.description, topic.keywords)
+                    for topic in catalog.topics
+                ],
+            )
+
+    def _query(self, text: str, limit: int) -> list[tuple[int, float]]:
+        collection = self._get_collection()
+        result = collection.query(
+            query_texts=[text[:_MAX_QUERY_TEXT_LENGTH]],
+            n_results=limit,
+            include=["distances"],
+        )
+        ids = result["ids"][0] if result["ids"] else []
+        distances = result["distances"][0] if result["distances"] else []
+        return [(int(topic_id), 1 - distance) for topic_id, distance in zip(ids, distances)]
+
+    async def match(
+        self, catalog: TopicSnapshot, title: str, text: str, limit: int
+    ) -> list[tuple[int, float]]:
+        if not catalog.topics:
+            return []
+        async with self._lock:
+            if self._synced_version != catalog.version:
+                await asyncio.to_thread(self._sync, catalog)
+                self._synced_version = catalog.version
+        matches = await asyncio.to_thread(
+            self._query, f"{title}\n\n{text}", min(limit, len(catalog.topics))
+        )
+        threshold = settings.topic_vector_min_similarity
+        return [(topic_id, similarity) for topic_id, similarity in matches if similarity >= threshold]
+
+
+topic_vector_index = TopicVectorIndex()
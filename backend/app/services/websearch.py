@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import heapq
+import logging
 import random
 import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from urllib.parse import urlparse
 from typing import Any
 
 import httpx
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.web_search_cache import WebSearchCacheEntry
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class WebSearchError(Exception):
@@ -19,30 +29,87 @@ class WebSearchError(Exception):
         self.message = message
 
 
+def _cache_key(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
 class WebSearchClient:
-    def __init__(self) -> None:
-        self._cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] | None = None
+    ) -> None:
+        self._session_factory = session_factory
+        self._cache: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._expiry: list[tuple[float, str]] = []
         self._lock = asyncio.Lock()
         self._timestamps: list[float] = []
+        self._in_flight: dict[str, asyncio.Future[list[dict[str, Any]]]] = {}
 
     def _purge_timestamps(self) -> None:
         cutoff = time.time() - 60
         self._timestamps = [ts for ts in self._timestamps if ts >= cutoff]
 
     def _purge_cache(self, now: float) -> None:
-        expired = [query for query, (expires_at, _) in self._cache.items() if expires_at <= now]
-        for query in expired:
-            self._cache.pop(query, None)
+        while self._expiry and self._expiry[0][0] <= now:
+            _, query = heapq.heappop(self._expiry)
+            cached = self._cache.get(query)
+            if cached and cached[0] <= now:
+                self._cache.pop(query, None)
 
     def _evict_overflow(self) -> None:
         max_entries = settings.web_search_cache_max_entries
         if max_entries <= 0:
             return
         while len(self._cache) > max_entries:
-            oldest = next(iter(self._cache), None)
-            if oldest is None:
-                break
-            self._cache.pop(oldest, None)
+            self._cache.popitem(last=False)
+        if len(self._expiry) > 2 * max_entries + 64:
+            self._expiry = [(expires_at, query) for query, (expires_at, _) in self._cache.items()]
+            heapq.heapify(self._expiry)
+
+    def _remember(self, query: str, expires_at: float, results: list[dict[str, Any]]) -> None:
+        self._cache[query] = (expires_at, results)
+        self._cache.move_to_end(query)
+        heapq.heappush(self._expiry, (expires_at, query))
+        self._evict_overflow()
+
+    def _persistent_enabled(self) -> bool:
+        return self._session_factory is not None and bool(settings.openserp_url)
+
+    async def _load_persistent(self, query: str) -> tuple[float, list[dict[str, Any]]] | None:
+        if not self._persistent_enabled():
+            return None
+        try:
+            async with self._session_factory() as session:
+                entry = await session.get(WebSearchCacheEntry, _cache_key(query))
+        except Exception:
+            logger.exception("Failed to read web search cache")
+            return None
+        if entry is None or entry.query != query:
+            return None
+        expires_at = entry.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at.timestamp() <= time.time():
+            return None
+        return expires_at.timestamp(), entry.results
+
+    async def _store_persistent(
+        self, query: str, expires_at: float, results: list[dict[str, Any]]
+    ) -> None:
+        if not self._persistent_enabled():
+            return
+        try:
+            async with self._session_factory() as session:
+                await session.merge(
+                    WebSearchCacheEntry(
+                        key=_cache_key(query),
+                        query=query,
+                        results=results,
+                        expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to write web search cache")
 
     def _openserp_base_url(self) -> str | None:
         if not settings.openserp_url:
@@ -52,25 +119,74 @@ class WebSearchClient:
             raise WebSearchError("OPENSERP_URL должен быть полным http/https URL.")
         return settings.openserp_url.rstrip("/")
 
-    async def search(self, query: str) -> list[dict[str, Any]]:
+    async def cached(self, query: str) -> list[dict[str, Any]] | None:
+        async with self._lock:
+            now = time.time()
+            self._purge_cache(now)
+            cached = self._cache.get(query)
+            if cached and cached[0] > now:
+                self._cache.move_to_end(query)
+                return cached[1]
+        stored = await self._load_persistent(query)
+        if stored is None:
+            return None
+        async with self._lock:
+            self._remember(query, *stored)
+        return stored[1]
+
+    async def search(self, query: str, cache_checked: bool = False) -> list[dict[str, Any]]:
         async with self._lock:
             now = time.time()
             self._purge_cache(now)
             cached = self._cache.get(query)
             if cached and cached[0] > now:
+                self._cache.move_to_end(query)
                 return cached[1]
 
+            shared = self._in_flight.get(query)
+            if shared is None:
+                future: asyncio.Future[list[dict[str, Any]]] = asyncio.get_running_loop().create_future()
+                future.add_done_callback(lambda done: done.cancelled() or done.exception())
+                self._in_flight[query] = future
+
+        if shared is not None:
+            return await asyncio.shield(shared)
+
+        try:
+            results = await self._load_or_fetch(query, cache_checked)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(results)
+            return results
+        finally:
+            self._in_flight.pop(query, None)
+
+    async def _load_or_fetch(self, query: str, cache_checked: bool) -> list[dict[str, Any]]:
+        # Callers that just missed in cached() skip the second read of the same row.
+        stored = None if cache_checked else await self._load_persistent(query)
+        if stored is not None:
+            async with self._lock:
+                self._remember(query, *stored)
+            return stored[1]
+
+        async with self._lock:
             self._purge_timestamps()
             if len(self._timestamps) >= settings.global_rate_limit_per_minute:
                 raise WebSearchError("Лимит запросов поиска исчерпан.")
+            self._timestamps.append(time.time())
 
-            self._timestamps.append(now)
-            results = await self._fetch(query)
-            ttl_minutes = random.randint(settings.web_search_cache_minutes_min, settings.web_search_cache_minutes_max)
-            ttl = ttl_minutes * 60
-            self._cache[query] = (now + ttl, results)
-            self._evict_overflow()
-            return results
+        results = await self._fetch(query)
+        ttl_minutes = random.randint(settings.web_search_cache_minutes_min, settings.web_search_cache_minutes_max)
+        expires_at = time.time() + ttl_minutes * 60
+        async with self._lock:
+            self._remember(query, expires_at, results)
+        await self._store_persistent(query, expires_at, results)
+        return results
 
     async def _fetch(self, query: str) -> list[dict[str, Any]]:
         base_url = self._openserp_base_url()
@@ -101,4 +217,9 @@ class WebSearchClient:
         raise WebSearchError("Поиск временно недоступен после 3 попыток.")
 
 
-web_search_client = WebSearchClient()
+async def cleanup_web_search_cache(session: AsyncSession) -> None:
+    now = datetime.now(timezone.utc)
+    await session.execute(delete(WebSearchCacheEntry).where(WebSearchCacheEntry.expires_at < now))
+
+
+web_search_client = WebSearchClient(SessionLocal if settings.web_search_cache_persistent else None)
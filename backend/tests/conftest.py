@@ -1,9 +1,55 @@
 from __future__ import annotations
 
+import re
+
 import pytest
+from chromadb.api.types import EmbeddingFunction
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.db.base import Base
+from app.services.cross_check import cross_check_coordinator
+from app.services.llm_cache import llm_response_cache
+from app.services.llm_governor import llm_governor
+from app.services.near_duplicates import near_duplicate_index
+from app.services.source_reputation import source_reputation
+from app.services.topic_catalog import topic_catalog
+
+
+class BagOfWords(EmbeddingFunction):
+    def __init__(self, vocabulary: list[str]) -> None:
+        self._vocabulary = vocabulary
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            tokens = re.findall(r"\w+", text.lower())
+            vectors.append([float(tokens.count(word)) + 0.01 for word in self._vocabulary])
+        return vectors
+
+    @staticmethod
+    def name() -> str:
+        return "bag-of-words-test"
+
+
+@pytest.fixture()
+def bag_of_words():
+    return BagOfWords
+
+
+@pytest.fixture(autouse=True)
+def reset_caches(monkeypatch):
+    monkeypatch.setattr(llm_governor, "_session_factory", None)
+    near_duplicate_index.clear()
+    topic_catalog.invalidate()
+    llm_response_cache.clear()
+    cross_check_coordinator.clear()
+    source_reputation.clear()
+    yield
+    near_duplicate_index.clear()
+    topic_catalog.invalidate()
+    llm_response_cache.clear()
+    cross_check_coordinator.clear()
+    source_reputation.clear()
 
 
 @pytest.fixture()
@@ -15,3 +61,12 @@ async def session() -> AsyncSession:
     async with session_maker() as session:
         yield session
     await engine.dispose()
+
+
+@pytest.fixture()
+async def session_factory(tmp_path) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    await engine.dispose()
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
 import pytest
 from sqlalchemy import select
 
 from app.models.item import Item, ItemTopic
 from app.models.source import Source
 from app.models.topic import Topic
+from app.services import autotagging
+from app.services import topic_catalog as topic_catalog_module
 from app.services.autotagging import assign_topics
 from app.services.ingestion import compute_content_hash
+from app.services.topic_catalog import CatalogTopic, topic_catalog
 
 
 @pytest.mark.asyncio
@@ -57,3 +63,104 @@ async def test_autotagging_respects_locked_topics(session):
     locked_ids = {row.topic_id for row in rows if row.locked}
     assert topic_locked.id in locked_ids
     assert any(row.topic_id == topic_auto.id for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_topic_catalog_reloads_after_topic_change(session):
+    session.add(Topic(name="Finance", keywords=["bank"]))
+    await session.commit()
+
+    first = await topic_catalog.get(session)
+    assert await topic_catalog.get(session) is first
+    assert [topic.name for topic in first.topics] == ["Finance"]
+
+    session.add(Topic(name="Tech", keywords=["ai"]))
+    await session.commit()
+    assert await topic_catalog.get(session) is first
+
+    topic_catalog.invalidate()
+    second = await topic_catalog.get(session)
+    assert [topic.name for topic in second.topics] == ["Finance", "Tech"]
+    assert second.matcher.scores("ai bank") == {topic.id: 1.0 for topic in second.topics}
+
+
+@pytest.mark.asyncio
+async def test_topic_catalog_detects_changes_from_other_processes(session, monkeypatch):
+    monkeypatch.setattr(topic_catalog_module.settings, "topic_catalog_check_seconds", 0)
+    session.add(Topic(name="Finance", keywords=["bank"]))
+    await session.commit()
+
+    first = await topic_catalog.get(session)
+    assert await topic_catalog.get(session) is first
+
+    session.add(Topic(name="Tech", keywords=["ai"]))
+    await session.commit()
+    second = await topic_catalog.get(session)
+    assert second is not first
+    assert len(second.topics) == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_wait_does_not_hold_a_db_connection(session_factory, monkeypatch):
+    async with session_factory() as session:
+        source = Source(name="rss", source_type="rss", url="http://example.com/rss")
+        topic = Topic(name="Finance", keywords=["bank"])
+        session.add_all([source, topic])
+        await session.flush()
+        item = Item(
+            source_id=source.id,
+            title="Quarterly update",
+            text="Nothing obvious here.",
+            content_hash="ambiguous",
+            lang="en",
+            is_job=False,
+        )
+        session.add(item)
+        await session.commit()
+        topic_id = topic.id
+    pool = session_factory.kw["bind"].pool
+    checked_out: list[int] = []
+
+    async def fake_classify(topics, title, text):
+        checked_out.append(pool.checkedout())
+        return [topic_id]
+
+    monkeypatch.setattr(autotagging.topic_batch_classifier, "classify", fake_classify)
+    async with session_factory() as session:
+        item = await session.get(Item, item.id)
+        await assign_topics(session, item)
+        await session.commit()
+        rows = (
+            await session.execute(select(ItemTopic).where(ItemTopic.item_id == item.id))
+        ).scalars().all()
+
+    assert checked_out == [0]
+    assert [row.topic_id for row in rows] == [topic_id]
+
+
+@pytest.mark.asyncio
+async def test_batch_classifier_sends_one_request_per_window(monkeypatch):
+    calls: list[str] = []
+
+    class FakeProvider:
+        async def chat(self, messages):
+            calls.append(messages[-1]["content"])
+            return json.dumps({"1": [1], "2": ["tech", 1], "3": [99]})
+
+    monkeypatch.setattr(autotagging, "get_llm_provider", lambda: FakeProvider())
+    monkeypatch.setattr(autotagging.settings, "topic_llm_batch_window_ms", 10)
+    topics = (
+        CatalogTopic(id=1, name="Finance", description=None, keywords=(), order=None),
+        CatalogTopic(id=2, name="Tech", description=None, keywords=(), order=None),
+    )
+    classifier = autotagging.TopicBatchClassifier()
+
+    results = await asyncio.gather(
+        classifier.classify(topics, "first", "text"),
+        classifier.classify(topics, "second", "text"),
+        classifier.classify(topics, "third", "text"),
+    )
+
+    assert results == [[1], [2, 1], []]
+    assert len(calls) == 1
+    assert calls[0].count("Finance") == 1
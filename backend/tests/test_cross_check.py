@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services import cross_check
+from app.services.cross_check import CrossCheckCoordinator, normalize_query
+from app.services.websearch import WebSearchError
+
+
+class FakeClient:
+    def __init__(self, cache: dict | None = None) -> None:
+        self.queries: list[str] = []
+        self.cache = cache or {}
+
+    async def cached(self, query: str):
+        return self.cache.get(query)
+
+    async def search(self, query: str, cache_checked: bool = False):
+        assert cache_checked
+        self.queries.append(query)
+        await asyncio.sleep(0.01)
+        return [{"title": query, "url": "http://example.com"}]
+
+
+def test_normalize_query_ignores_case_order_and_punctuation():
+    assert normalize_query("Сбербанк: выручка выросла!")[0] == normalize_query("выручка выросла, Сбербанк")[0]
+
+
+@pytest.mark.asyncio
+async def test_near_identical_queries_share_one_search(monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 6000)
+    client = FakeClient()
+    coordinator = CrossCheckCoordinator(client)
+
+    results = await asyncio.gather(
+        coordinator.search("Сбербанк отчитался о рекордной прибыли за квартал"),
+        coordinator.search("сбербанк отчитался о рекордной прибыли за квартал!"),
+        coordinator.search("Сбербанк отчитался о рекордной прибыли за третий квартал"),
+        coordinator.search("Газпром сократил добычу"),
+    )
+
+    assert len(client.queries) == 2
+    assert results[0] == results[1] == results[2]
+    assert await coordinator.search("СБЕРБАНК отчитался о рекордной прибыли за квартал") == results[0]
+    assert len(client.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_searches_are_paced_across_minute_budget(monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 600)
+    monkeypatch.setattr(cross_check.settings, "cross_check_max_wait_seconds", 0.15)
+    client = FakeClient()
+    coordinator = CrossCheckCoordinator(client)
+
+    outcomes = await asyncio.gather(
+        *(coordinator.search(f"query number {index}") for index in range(4)),
+        return_exceptions=True,
+    )
+
+    assert sum(isinstance(outcome, list) for outcome in outcomes) == 2
+    assert sum(isinstance(outcome, WebSearchError) for outcome in outcomes) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_queries_do_not_take_pacing_slots(monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 60)
+    monkeypatch.setattr(cross_check.settings, "cross_check_max_wait_seconds", 0.1)
+    cache = {f"cached query {index}": [{"title": str(index)}] for index in range(5)}
+    client = FakeClient(cache)
+    coordinator = CrossCheckCoordinator(client)
+
+    assert await coordinator.search("fresh query") == [{"title": "fresh query", "url": "http://example.com"}]
+    outcomes = await asyncio.gather(*(coordinator.search(query) for query in cache))
+
+    assert outcomes == list(cache.values())
+    assert client.queries == ["fresh query"]
+
+
+@pytest.mark.asyncio
+async def test_reserved_idle_slot_is_spent_by_the_next_search(monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 1)
+    monkeypatch.setattr(cross_check.settings, "cross_check_max_wait_seconds", 0.1)
+    client = FakeClient()
+    coordinator = CrossCheckCoordinator(client)
+
+    assert coordinator.try_reserve_idle_slot()
+    assert not coordinator.try_reserve_idle_slot()
+    assert await coordinator.search("reserved query")
+    assert client.queries == ["reserved query"]
+    with pytest.raises(WebSearchError):
+        await coordinator.search("unreserved query")
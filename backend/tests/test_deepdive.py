@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models.item import Item
+from app.models.source import Source
+from app.services import deepdive
+from app.services.ai_assistant import is_generic_clarification
+from app.services.deepdive import get_precomputed_report, precompute_deepdive
+
+
+async def _item(session, index: int, impact: str) -> Item:
+    if index == 0:
+        session.add(Source(id=1, name="rss", source_type="rss", url="http://example.com/rss"))
+        await session.flush()
+    item = Item(
+        source_id=1,
+        title=f"Item {index}",
+        text="Text",
+        content_hash=f"hash-{index}",
+        lang="ru",
+        is_job=False,
+        impact=impact,
+    )
+    session.add(item)
+    await session.flush()
+    return item
+
+
+@pytest.mark.asyncio
+async def test_precompute_respects_impact_and_daily_budget(session, monkeypatch):
+    generated: list[int] = []
+
+    async def fake_report(item, related=None):
+        assert not session.in_transaction()
+        generated.append(item.id)
+        return f"Отчёт {item.id}"
+
+    monkeypatch.setattr(deepdive, "generate_base_deepdive_report", fake_report)
+    monkeypatch.setattr(deepdive.settings, "deepdive_precompute_enabled", True)
+    monkeypatch.setattr(deepdive.settings, "deepdive_precompute_daily_budget", 1)
+
+    low = await _item(session, 0, "low")
+    first = await _item(session, 1, "high")
+    second = await _item(session, 2, "high")
+
+    assert await precompute_deepdive(session, low) is False
+    assert await precompute_deepdive(session, first) is True
+    assert await precompute_deepdive(session, first) is False
+    assert await precompute_deepdive(session, second) is False
+
+    assert generated == [first.id]
+    assert await get_precomputed_report(session, first.id) == f"Отчёт {first.id}"
+    assert await get_precomputed_report(session, second.id) is None
+
+
+def test_generic_clarification_detection():
+    assert is_generic_clarification("  Нет. ")
+    assert is_generic_clarification("в  целом")
+    assert not is_generic_clarification("Как это повлияет на ставки?")
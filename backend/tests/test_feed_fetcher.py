@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import feed_fetcher as feed_fetcher_module
+from app.services.feed_fetcher import FeedFetchError, FeedFetcher, parse_feed
+
+_RSS = (
+    b"<rss><channel><title>Demo</title>"
+    b"<item><title>Entry</title><link>http://example.com/1</link></item>"
+    b"</channel></rss>"
+)
+
+
+def _fetcher_with(handler) -> FeedFetcher:
+    fetcher = FeedFetcher()
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_fetch_sends_validators_and_handles_not_modified():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=_RSS, headers={"etag": '"v1"'})
+
+    fetcher = _fetcher_with(handler)
+    first = await fetcher.fetch("http://example.com/rss")
+    second = await fetcher.fetch("http://example.com/rss", etag=first.etag)
+    await fetcher.aclose()
+
+    assert first.status == 200 and first.content == _RSS
+    assert second.not_modified
+    assert seen[1].headers["if-none-match"] == '"v1"'
+
+    feed = await parse_feed(first.content)
+    assert feed.entries[0].title == "Entry"
+
+
+@pytest.mark.asyncio
+async def test_relative_links_resolve_against_final_feed_url():
+    content = b"<rss><channel><item><title>Entry</title><link>/news/1</link></item></channel></rss>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/rss":
+            return httpx.Response(301, headers={"location": "https://feeds.example.com/v2/rss"})
+        return httpx.Response(200, content=content)
+
+    fetcher = _fetcher_with(handler)
+    fetcher._client.follow_redirects = True
+    fetched = await fetcher.fetch("http://example.com/rss")
+    await fetcher.aclose()
+
+    feed = await parse_feed(fetched.content, fetched.content_type, fetched.url)
+    assert fetched.url == "https://feeds.example.com/v2/rss"
+    assert feed.entries[0].link == "https://feeds.example.com/news/1"
+
+
+@pytest.mark.asyncio
+async def test_fetch_enforces_size_cap(monkeypatch):
+    monkeypatch.setattr(feed_fetcher_module.settings, "feed_fetch_max_bytes", 16)
+    fetcher = _fetcher_with(lambda request: httpx.Response(200, content=_RSS))
+    with pytest.raises(FeedFetchError):
+        await fetcher.fetch("http://example.com/rss")
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_host_wait_does_not_count_against_timeout(monkeypatch):
+    monkeypatch.setattr(feed_fetcher_module.settings, "feed_fetch_per_host_concurrency", 1)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, content=_RSS)
+
+    fetcher = _fetcher_with(handler)
+    results = await asyncio.gather(
+        *(fetcher.fetch(f"http://example.com/rss{index}", timeout=0.15) for index in range(3))
+    )
+    assert [result.status for result in results] == [200, 200, 200]
+    assert fetcher._host_limits == {}
+    await fetcher.aclose()
@@ -3,12 +3,12 @@ from __future__ import annotations
 import time
 
 import pytest
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event, func, select
 
 from app.models.item import Item
 from app.models.source import Source
 from app.services import ingestion
+from app.services.feed_fetcher import FetchedFeed
 
 
 class DummyFeed:
@@ -17,6 +17,17 @@ class DummyFeed:
         self.feed = feed or {}
 
 
+def _stub_feed(monkeypatch, feed: DummyFeed) -> None:
+    async def fake_fetch(url, etag=None, last_modified=None, timeout=None):
+        return FetchedFeed(status=200, content=b"<rss/>")
+
+    async def fake_parse(content, content_type=None, url=None):
+        return feed
+
+    monkeypatch.setattr(ingestion.feed_fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(ingestion, "parse_feed", fake_parse)
+
+
 @pytest.mark.asyncio
 async def test_ingest_rss_source_inserts_items(session, monkeypatch):
     source = Source(name="rss", source_type="rss", url="http://example.com/rss")
@@ -34,7 +45,7 @@ async def test_ingest_rss_source_inserts_items(session, monkeypatch):
         }
     ]
     feed = DummyFeed(entries, feed={"language": "en"})
-    monkeypatch.setattr(ingestion.feedparser, "parse", lambda url: feed)
+    _stub_feed(monkeypatch, feed)
 
     added = await ingestion.ingest_rss_source(session, source)
     assert added == 1
@@ -71,7 +82,7 @@ async def test_ingest_rss_source_marks_jobs(session, monkeypatch):
         }
     ]
     feed = DummyFeed(entries, feed={"language": "ru"})
-    monkeypatch.setattr(ingestion.feedparser, "parse", lambda url: feed)
+    _stub_feed(monkeypatch, feed)
 
     added = await ingestion.ingest_rss_source(session, source)
     assert added == 1
@@ -83,7 +94,7 @@ async def test_ingest_rss_source_marks_jobs(session, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_ingest_rss_handles_integrity_error(session, monkeypatch):
+async def test_ingest_rss_skips_items_inserted_concurrently(session, monkeypatch):
     source = Source(name="rss", source_type="rss", url="http://example.com/rss")
     session.add(source)
     await session.commit()
@@ -105,20 +116,128 @@ async def test_ingest_rss_handles_integrity_error(session, monkeypatch):
             "published_parsed": time.gmtime(1_700_000_100),
         },
     ]
-    feed = DummyFeed(entries, feed={"language": "en"})
-    monkeypatch.setattr(ingestion.feedparser, "parse", lambda url: feed)
+    _stub_feed(monkeypatch, DummyFeed(entries, feed={"language": "en"}))
+
+    async def racing_lookup(session, hashes):
+        # Another worker stores the first entry between the dedup lookup and the insert.
+        session.add(
+            Item(
+                source_id=source.id,
+                title="First entry",
+                text="Body",
+                url="http://example.com/1",
+                content_hash=ingestion.compute_content_hash(
+                    "First entry", "http://example.com/1", "Body"
+                ),
+                lang="en",
+                is_job=False,
+            )
+        )
+        await session.flush()
+        return set()
+
+    monkeypatch.setattr(ingestion, "_existing_hashes", racing_lookup)
 
-    original_flush = session.flush
-    call_count = 0
+    added = await ingestion.ingest_rss_source(session, source)
+    assert added == 1
+    await session.commit()
+    count = (await session.execute(select(func.count()).select_from(Item))).scalar_one()
+    assert count == 2
 
-    async def flaky_flush(*args, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            raise IntegrityError("stmt", "params", None)
-        return await original_flush(*args, **kwargs)
 
-    monkeypatch.setattr(session, "flush", flaky_flush)
+@pytest.mark.asyncio
+async def test_ingest_rss_source_uses_conditional_get(session, monkeypatch):
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss")
+    session.add(source)
+    await session.commit()
+    await session.refresh(source)
 
-    added = await ingestion.ingest_rss_source(session, source)
-    assert added == 1
+    entries = [
+        {
+            "title": "Test entry",
+            "link": "http://example.com/1",
+            "summary": "Body",
+            "id": "1",
+            "published_parsed": time.gmtime(1_700_000_000),
+        }
+    ]
+    calls: list[dict] = []
+    responses = [
+        FetchedFeed(
+            status=200,
+            content=b"<rss/>",
+            etag='"v1"',
+            last_modified="Tue, 14 Nov 2023 22:13:20 GMT",
+        ),
+        FetchedFeed(status=304),
+    ]
+    parsed: list[bytes] = []
+
+    async def fake_fetch(url, etag=None, last_modified=None, timeout=None):
+        calls.append({"etag": etag, "last_modified": last_modified})
+        return responses[len(calls) - 1]
+
+    async def fake_parse(content, content_type=None, url=None):
+        parsed.append(content)
+        return DummyFeed(entries)
+
+    monkeypatch.setattr(ingestion.feed_fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(ingestion, "parse_feed", fake_parse)
+
+    assert await ingestion.ingest_rss_source(session, source) == 1
+    await session.commit()
+    assert source.state["etag"] == '"v1"'
+
+    assert await ingestion.ingest_rss_source(session, source) == 0
+    assert calls[0] == {"etag": None, "last_modified": None}
+    assert calls[1] == {"etag": '"v1"', "last_modified": "Tue, 14 Nov 2023 22:13:20 GMT"}
+    assert len(parsed) == 1
+    assert source.state["etag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_ingest_rss_source_checks_hashes_in_one_query(session, monkeypatch):
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss")
+    session.add(source)
+    await session.commit()
+    await session.refresh(source)
+
+    entries = [
+        {
+            "title": f"Entry {index}",
+            "link": f"http://example.com/{index}",
+            "summary": "Body",
+            "id": str(index),
+            "published_parsed": time.gmtime(1_700_000_000 + index),
+        }
+        for index in range(5)
+    ]
+    existing = entries[0]
+    session.add(
+        Item(
+            source_id=source.id,
+            title=existing["title"],
+            text="Body",
+            url=existing["link"],
+            content_hash=ingestion.compute_content_hash(existing["title"], existing["link"], "Body"),
+            lang="en",
+            is_job=False,
+        )
+    )
+    await session.commit()
+    _stub_feed(monkeypatch, DummyFeed(entries + [entries[1]]))
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        added = await ingestion.ingest_rss_source(session, source)
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", record)
+
+    assert added == 4
+    hash_lookups = [stmt for stmt in statements if "items.content_hash IN" in stmt]
+    assert len(hash_lookups) == 1
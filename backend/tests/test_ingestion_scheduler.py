@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.source import Source
+from app.services import ingestion
+from app.services.ingestion_scheduler import IngestionScheduler, next_run_at
+
+
+@pytest.mark.asyncio
+async def test_slow_source_does_not_block_others(session_factory, monkeypatch):
+    async with session_factory() as session:
+        slow = Source(name="slow", source_type="rss", url="http://slow.example.com/rss")
+        fast = Source(name="fast", source_type="rss", url="http://fast.example.com/rss")
+        session.add_all([slow, fast])
+        await session.commit()
+        slow_id, fast_id = slow.id, fast.id
+
+    release = asyncio.Event()
+    finished: list[int] = []
+
+    async def fake_ingest(session, source):
+        if source.id == slow_id:
+            await release.wait()
+        source.state = {"last_ingested_at": datetime.now(timezone.utc).isoformat()}
+        finished.append(source.id)
+        return 0
+
+    monkeypatch.setattr(ingestion, "ingest_rss_source", fake_ingest)
+
+    scheduler = IngestionScheduler(session_factory)
+    await scheduler.refresh_sources()
+    tasks = scheduler.dispatch_due(time.time())
+    assert len(tasks) == 2
+
+    for _ in range(50):
+        if fast_id in finished:
+            break
+        await asyncio.sleep(0.01)
+    assert finished == [fast_id]
+    assert scheduler.dispatch_due(time.time()) == []
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler._next_run[slow_id] > time.time()
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_network_fetch_does_not_hold_a_db_connection(session_factory, monkeypatch):
+    async with session_factory() as session:
+        source = Source(name="rss", source_type="rss", url="http://example.com/rss")
+        session.add(source)
+        await session.commit()
+    pool = session_factory.kw["bind"].pool
+    checked_out: list[int] = []
+
+    async def fake_ingest(session, source):
+        checked_out.append(pool.checkedout())
+        source.state = {"last_ingested_at": datetime.now(timezone.utc).isoformat()}
+        return 0
+
+    monkeypatch.setattr(ingestion, "ingest_rss_source", fake_ingest)
+    scheduler = IngestionScheduler(session_factory)
+    await scheduler.refresh_sources()
+    await asyncio.gather(*scheduler.dispatch_due(time.time()))
+    await scheduler.shutdown()
+
+    assert checked_out == [0]
+    async with session_factory() as session:
+        assert "last_ingested_at" in (await session.get(Source, source.id)).state
+
+
+def test_next_run_honours_retry_after():
+    now = time.time()
+    retry_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    state = {
+        "last_ingested_at": datetime.now(timezone.utc).isoformat(),
+        "retry_after": retry_at.isoformat(),
+    }
+    assert next_run_at(state, now) == pytest.approx(retry_at.timestamp())
+    assert next_run_at(None, now) == now
+
+
+@pytest.mark.asyncio
+async def test_failing_source_backs_off_full_interval(session_factory, monkeypatch):
+    async with session_factory() as session:
+        source = Source(name="broken", source_type="rss", url="http://broken.example.com/rss")
+        session.add(source)
+        await session.commit()
+        source_id = source.id
+
+    async def failing_ingest(session, source):
+        raise RuntimeError("feed is down")
+
+    monkeypatch.setattr(ingestion, "ingest_rss_source", failing_ingest)
+
+    scheduler = IngestionScheduler(session_factory)
+    await scheduler.refresh_sources()
+    started = time.time()
+    await asyncio.gather(*scheduler.dispatch_due(started))
+    assert scheduler._next_run[source_id] >= started + ingestion.settings.ingestion_interval_seconds
+    assert scheduler.dispatch_due(time.time()) == []
+    await scheduler.shutdown()
+
+
+def test_poll_interval_adapts_to_publish_rate(monkeypatch):
+    from app.services import ingestion_scheduler
+
+    monkeypatch.setattr(ingestion_scheduler.settings, "ingestion_min_interval_seconds", 60)
+    monkeypatch.setattr(ingestion_scheduler.settings, "ingestion_max_interval_seconds", 3600)
+    now = time.time()
+    polled_at = datetime.fromtimestamp(now - 600, tz=timezone.utc).isoformat()
+
+    busy = ingestion_scheduler.update_poll_stats({"last_polled_at": polled_at}, {}, 20, now)
+    quiet = ingestion_scheduler.update_poll_stats(
+        {"last_polled_at": polled_at, "poll_rate_per_hour": 0.1}, {}, 0, now
+    )
+
+    assert ingestion_scheduler.poll_interval(busy, now) == 60
+    assert ingestion_scheduler.poll_interval(quiet, now) == 3600
+
+    silent = {
+        "poll_rate_per_hour": 60.0,
+        "last_published_at": (datetime.now(timezone.utc) - timedelta(hours=4)).isoformat(),
+    }
+    assert ingestion_scheduler.poll_interval(silent, now) == pytest.approx(3600)
+
+
+def test_telegram_message_ids_count_towards_rate():
+    now = time.time()
+    polled_at = datetime.fromtimestamp(now - 3600, tz=timezone.utc).isoformat()
+    previous = {"last_polled_at": polled_at, "last_message_id": 10}
+    state = {"last_message_id": 40}
+    from app.services.ingestion_scheduler import update_poll_stats
+
+    updated = update_poll_stats(previous, state, 5, now)
+    assert updated["poll_rate_per_hour"] == pytest.approx(30.0)
+
+
+def test_default_floor_polls_busy_sources_faster():
+    from app.services import ingestion_scheduler
+
+    now = time.time()
+    busy = {"poll_rate_per_hour": 600.0}
+    assert ingestion_scheduler.poll_interval(busy, now) < ingestion_scheduler.settings.ingestion_interval_seconds
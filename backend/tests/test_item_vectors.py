@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import chromadb
+import pytest
+
+from app.models.item import Item
+from app.models.source import Source
+from app.services import chroma, item_vectors
+from app.services.item_vectors import ItemVectorIndex, find_similar_items
+
+_VOCABULARY = ["bank", "rate", "inflation", "robot", "football"]
+
+
+@pytest.mark.asyncio
+async def test_item_index_returns_recent_similar_items(session, monkeypatch, bag_of_words):
+    client = chromadb.EphemeralClient()
+    try:
+        client.delete_collection(chroma._collection_name("items"))
+    except Exception:
+        pass
+    index = ItemVectorIndex(client=client, embedding_function=bag_of_words(_VOCABULARY))
+    monkeypatch.setattr(item_vectors, "item_vector_index", index)
+    monkeypatch.setattr(item_vectors.settings, "item_vector_enabled", True)
+    monkeypatch.setattr(item_vectors.settings, "item_vector_batch_size", 3)
+
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss")
+    session.add(source)
+    await session.flush()
+    now = datetime.now(timezone.utc)
+    texts = [
+        ("Bank raises rate", "bank rate inflation", now),
+        ("Central bank rate", "bank rate inflation rate", now - timedelta(days=1)),
+        ("Old bank rate", "bank rate inflation", now - timedelta(days=30)),
+        ("Robot wins", "robot football", now),
+    ]
+    items = []
+    for index_, (title, text, published_at) in enumerate(texts):
+        item = Item(
+            source_id=source.id,
+            external_id=str(index_),
+            title=title,
+            text=text,
+            published_at=published_at,
+            content_hash=f"hash-{index_}",
+            lang="en",
+            is_job=False,
+        )
+        session.add(item)
+        items.append(item)
+    untagged = Item(
+        source_id=source.id,
+        title="Bank rate pending",
+        text="bank rate",
+        content_hash="hash-untagged",
+        lang="en",
+        is_job=False,
+        pipeline_stage="tag",
+    )
+    session.add(untagged)
+    await session.commit()
+
+    assert await index.sync(session) == 3
+    assert await index.sync(session) == 1
+    assert await index.sync(session) == 0
+    await session.commit()
+    for item in items:
+        await session.refresh(item)
+        assert item.vector_indexed_at is not None
+    await session.refresh(untagged)
+    assert untagged.vector_indexed_at is None
+
+    related = await find_similar_items(session, items[0], days=7, limit=2)
+    assert [other.id for other, _ in related][0] == items[1].id
+    assert items[2].id not in {other.id for other, _ in related}
+    assert items[0].id not in {other.id for other, _ in related}
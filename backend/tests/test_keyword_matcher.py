@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+import re
+
+from app.services.keyword_matcher import KeywordMatcher
+
+
+def _reference_scores(text: str, keywords_by_topic: dict[int, list[str]]) -> dict[int, float]:
+    scores: dict[int, float] = {}
+    for topic_id, keywords in keywords_by_topic.items():
+        score = 0.0
+        for keyword in keywords:
+            cleaned = keyword.strip().lower()
+            if cleaned:
+                score += len(re.findall(re.escape(cleaned), text))
+        if score:
+            scores[topic_id] = score
+    return scores
+
+
+def test_matcher_counts_like_findall():
+    keywords = {
+        1: ["ai", "bank", " Bank ", "ai"],
+        2: ["aa", "aaa", "a.b"],
+        3: ["", "she", "he", "hers"],
+        4: [],
+    }
+    text = "ai banking: the bank said aaaaa a.b ushers her"
+    assert KeywordMatcher(keywords).scores(text) == _reference_scores(text, keywords)
+
+
+def test_matcher_matches_reference_on_random_text():
+    rng = random.Random(7)
+    alphabet = "abc "
+    keywords = {
+        topic_id: ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(5)]
+        for topic_id in range(20)
+    }
+    matcher = KeywordMatcher(keywords)
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(200))
+        assert matcher.scores(text) == _reference_scores(text, keywords)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services import llm_cache
+from app.services.llm_cache import LlmResponseCache, cache_key, llm_response_cache
+from app.services.metrics import collect_llm_metrics
+
+
+def test_cache_key_normalizes_whitespace_and_case():
+    first = cache_key("m", [{"role": "user", "content": "Что  будет\nдальше?"}])
+    second = cache_key("m", [{"role": "user", "content": "что будет дальше?"}])
+    assert first == second
+    assert cache_key("other", [{"role": "user", "content": "что будет дальше?"}]) != first
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_persistent_entries_across_instances(session_factory, monkeypatch):
+    monkeypatch.setattr(llm_cache.settings, "llm_cache_persistent", True)
+    messages = [{"role": "user", "content": "вопрос"}]
+    writer = LlmResponseCache(session_factory)
+    reader = LlmResponseCache(session_factory)
+
+    assert await writer.get("m", messages) is None
+    await writer.set("m", messages, "ответ")
+    assert await writer.get("m", messages) == "ответ"
+    assert await reader.get("m", messages) == "ответ"
+
+    assert writer.drain_stats() == (1, 1)
+    assert writer.drain_stats() == (0, 0)
+    assert reader.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_and_evicts(monkeypatch):
+    monkeypatch.setattr(llm_cache.settings, "llm_cache_max_entries", 1)
+    cache = LlmResponseCache()
+    await cache.set("m", [{"role": "user", "content": "a"}], "A")
+    await cache.set("m", [{"role": "user", "content": "b"}], "B")
+    assert await cache.get("m", [{"role": "user", "content": "a"}]) is None
+    assert await cache.get("m", [{"role": "user", "content": "b"}]) == "B"
+
+    monkeypatch.setattr(llm_cache.settings, "llm_cache_ttl_seconds", -1)
+    await cache.set("m", [{"role": "user", "content": "c"}], "C")
+    assert await cache.get("m", [{"role": "user", "content": "c"}]) is None
+
+
+def test_llm_metrics_are_labelled_by_process():
+    llm_response_cache.hits = 3
+    llm_response_cache.misses = 1
+    metrics = {metric.name: metric for metric in collect_llm_metrics("bot")}
+    assert metrics["llm.cache_hits"].value == 3
+    assert metrics["llm.cache_misses"].labels == {"process": "bot"}
+    assert llm_response_cache.drain_stats() == (0, 0)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.models.llm_lease import LlmLease
+from app.services import llm_governor as llm_governor_module
+from app.services.llm_governor import BACKGROUND, INTERACTIVE, LlmGovernor, llm_priority
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_jump_background_queue():
+    governor = LlmGovernor(max_concurrency=1, background_concurrency=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def call(name: str, priority: int, hold: bool = False) -> None:
+        async with governor.slot(priority):
+            order.append(name)
+            if hold:
+                await release.wait()
+
+    first = asyncio.create_task(call("bg-1", BACKGROUND, hold=True))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(call("bg-2", BACKGROUND)),
+        asyncio.create_task(call("bg-3", BACKGROUND)),
+    ]
+    await asyncio.sleep(0)
+    queued.append(asyncio.create_task(call("user", INTERACTIVE)))
+    await asyncio.sleep(0)
+    assert governor.queue_depths() == {"interactive": 1, "background": 2}
+
+    release.set()
+    await asyncio.gather(first, *queued)
+
+    assert order == ["bg-1", "user", "bg-2", "bg-3"]
+    stats = governor.drain_wait_stats()
+    assert stats["background"][0] == 3
+    assert stats["interactive"][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_limit_leaves_room_for_interactive():
+    governor = LlmGovernor(max_concurrency=2, background_concurrency=1)
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def call(name: str, priority: int) -> None:
+        async with governor.slot(priority):
+            started.append(name)
+            await release.wait()
+
+    tasks = [
+        asyncio.create_task(call("bg-1", BACKGROUND)),
+        asyncio.create_task(call("bg-2", BACKGROUND)),
+        asyncio.create_task(call("user", INTERACTIVE)),
+    ]
+    await asyncio.sleep(0.01)
+    assert started == ["bg-1", "user"]
+
+    tasks[1].cancel()
+    release.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert governor.queue_depths() == {"interactive": 0, "background": 0}
+
+
+@pytest.mark.asyncio
+async def test_priority_defaults_to_task_context():
+    governor = LlmGovernor(max_concurrency=1, background_concurrency=1)
+
+    async def background_call() -> int:
+        llm_priority.set(BACKGROUND)
+        async with governor.slot():
+            return llm_priority.get()
+
+    assert await asyncio.create_task(background_call()) == BACKGROUND
+    assert llm_priority.get() == INTERACTIVE
+
+
+@pytest.mark.asyncio
+async def test_shared_leases_prioritise_interactive_across_processes(session_factory, monkeypatch):
+    monkeypatch.setattr(llm_governor_module.settings, "llm_governor_poll_ms", 10)
+    api = LlmGovernor(max_concurrency=1, background_concurrency=1, session_factory=session_factory)
+    bot = LlmGovernor(max_concurrency=1, background_concurrency=1, session_factory=session_factory)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def call(governor: LlmGovernor, name: str, priority: int, hold: bool = False) -> None:
+        async with governor.slot(priority):
+            order.append(name)
+            if hold:
+                await release.wait()
+
+    first = asyncio.create_task(call(api, "bg-1", BACKGROUND, hold=True))
+    await asyncio.sleep(0.05)
+    background = asyncio.create_task(call(api, "bg-2", BACKGROUND))
+    await asyncio.sleep(0.05)
+    interactive = asyncio.create_task(call(bot, "user", INTERACTIVE))
+    await asyncio.sleep(0.05)
+    assert order == ["bg-1"]
+
+    release.set()
+    await asyncio.gather(first, background, interactive)
+    assert order == ["bg-1", "user", "bg-2"]
+    async with session_factory() as session:
+        assert (await session.execute(select(LlmLease))).scalars().all() == []
+    assert bot.drain_wait_stats()["interactive"][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_orphaned_waiting_lease_expires_quickly(session_factory, monkeypatch):
+    monkeypatch.setattr(llm_governor_module.settings, "llm_governor_poll_ms", 10)
+    async with session_factory() as session:
+        expires_at = llm_governor_module._lease_expiry(active=False)
+        session.add(LlmLease(priority=INTERACTIVE, active=False, expires_at=expires_at))
+        await session.commit()
+    governor = LlmGovernor(max_concurrency=1, background_concurrency=1, session_factory=session_factory)
+
+    async with asyncio.timeout(1):
+        async with governor.slot(BACKGROUND):
+            pass
+        async with governor.slot(INTERACTIVE):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_lease_errors_while_waiting_fall_back_to_local_slot(session_factory, monkeypatch):
+    governor = LlmGovernor(max_concurrency=1, background_concurrency=1, session_factory=session_factory)
+
+    async def broken_activate(lease_id, priority):
+        raise OperationalError("SELECT", {}, Exception("database is gone"))
+
+    monkeypatch.setattr(governor, "_try_activate", broken_activate)
+    entered = False
+    async with governor.slot(INTERACTIVE):
+        entered = True
+
+    assert entered
+    async with session_factory() as session:
+        assert (await session.execute(select(LlmLease))).scalars().all() == []
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from app.services import llm_provider
+from app.services.llm_provider import (
+    LlmProvider,
+    LlmProviderError,
+    close_llm_http_client,
+    get_llm_http_client,
+)
+
+
+@pytest.mark.asyncio
+async def test_chat_reuses_shared_client(monkeypatch):
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_provider, "_client", client)
+    provider = LlmProvider(base_url="http://llm", model="test", api_key="secret")
+
+    assert await provider.chat([{"role": "user", "content": "hi"}]) == "ok"
+    assert await provider.chat([{"role": "user", "content": "again"}]) == "ok"
+
+    assert get_llm_http_client() is client
+    assert len(seen) == 2
+    assert seen[0].headers["Authorization"] == "Bearer secret"
+    assert seen[0].extensions["timeout"]["read"] == llm_provider.settings.litellm_timeout_seconds
+    await close_llm_http_client()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_yields_sse_deltas(monkeypatch):
+    body = (
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "При"}}]}\n\n'
+        ": keep-alive\n\n"
+        'data: {"choices": [{"delta": {"content": "вет"}}]}\n\n'
+        'data: {"choices": []}\n\n'
+        "data: [DONE]\n\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_provider, "_client", client)
+    provider = LlmProvider(base_url="http://llm", model="test")
+
+    chunks = [chunk async for chunk in provider.chat_stream([{"role": "user", "content": "hi"}])]
+
+    assert chunks == ["При", "вет"]
+    await close_llm_http_client()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_wraps_http_errors(monkeypatch):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: httpx.Response(502)))
+    monkeypatch.setattr(llm_provider, "_client", client)
+    provider = LlmProvider(base_url="http://llm", model="test")
+
+    with pytest.raises(LlmProviderError):
+        async for _ in provider.chat_stream([{"role": "user", "content": "hi"}]):
+            pass
+    await close_llm_http_client()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.item import Item
+from app.models.source import Source
+from app.services import near_duplicates
+from app.services.ingestion import compute_content_hash
+from app.services.near_duplicates import SimHashIndex, assign_clusters, compute_simhash, near_duplicate_index
+
+_ORIGINAL = (
+    "Центробанк повысил ключевую ставку до 18 процентов годовых на внеочередном "
+    "заседании совета директоров в понедельник, сообщила пресс-служба регулятора"
+)
+_REPOST = (
+    "Центробанк повысил ключевую ставку до 18 процентов годовых на внеочередном "
+    "заседании совета директоров в понедельник, сообщила пресс-служба регулятора!!! Подписывайтесь"
+)
+_OTHER = (
+    "Команда разработчиков выпустила новую версию компилятора с поддержкой "
+    "параллельной сборки и улучшенной диагностикой ошибок для больших проектов"
+)
+
+
+def test_simhash_matches_near_duplicates_only():
+    index = SimHashIndex()
+    index.add(1, compute_simhash(_ORIGINAL), 1)
+
+    assert index.match(compute_simhash(_REPOST)) == 1
+    assert index.match(compute_simhash(_OTHER)) is None
+    assert compute_simhash("слишком короткий текст") is None
+
+
+def test_simhash_ignores_matches_outside_window(monkeypatch):
+    monkeypatch.setattr(near_duplicates.settings, "near_duplicate_window_hours", 12)
+    index = SimHashIndex()
+    now = time.time()
+    index.add(1, compute_simhash(_ORIGINAL), 1, timestamp=now - 86400)
+
+    assert index.match(compute_simhash(_REPOST), timestamp=now) is None
+    assert index.match(compute_simhash(_REPOST), timestamp=now - 80000) == 1
+
+
+@pytest.mark.asyncio
+async def test_assign_clusters_links_reposts_to_first_item(session):
+    near_duplicate_index.clear()
+    source = Source(name="tg", source_type="telegram", url="@demo")
+    session.add(source)
+    await session.flush()
+    items = [
+        Item(
+            source_id=source.id,
+            title=text[:40],
+            text=text,
+            content_hash=compute_content_hash(text[:40], None, text + str(index)),
+            lang="ru",
+            is_job=False,
+            simhash=compute_simhash(text),
+        )
+        for index, text in enumerate([_ORIGINAL, _REPOST, _OTHER])
+    ]
+    session.add_all(items)
+    await session.flush()
+
+    await assign_clusters(session, items)
+
+    original, repost, other = items
+    assert original.cluster_id is None
+    assert repost.cluster_id == original.id
+    assert other.cluster_id is None
+    near_duplicate_index.clear()
+
+
+@pytest.mark.asyncio
+async def test_assign_clusters_publishes_fingerprints_only_after_commit(session):
+    near_duplicate_index.clear()
+    source = Source(name="tg", source_type="telegram", url="@demo")
+    session.add(source)
+    await session.commit()
+
+    def make(text: str, suffix: str) -> Item:
+        return Item(
+            source_id=source_id,
+            title=text[:40],
+            text=text,
+            content_hash=compute_content_hash(text[:40], None, text + suffix),
+            lang="ru",
+            is_job=False,
+            simhash=compute_simhash(text),
+        )
+
+    source_id = source.id
+    rolled_back = make(_ORIGINAL, "rolled-back")
+    session.add(rolled_back)
+    await session.flush()
+    await assign_clusters(session, [rolled_back])
+    assert len(near_duplicate_index) == 0
+    await session.rollback()
+    assert len(near_duplicate_index) == 0
+
+    original = make(_ORIGINAL, "original")
+    session.add(original)
+    await session.flush()
+    await assign_clusters(session, [original])
+    original_id = original.id
+    await session.commit()
+    assert near_duplicate_index.match(compute_simhash(_REPOST)) == original_id
+
+    repost = make(_REPOST, "repost")
+    session.add(repost)
+    await session.flush()
+    await assign_clusters(session, [repost])
+    assert repost.cluster_id == original_id
+    near_duplicate_index.clear()
+
+
+@pytest.mark.asyncio
+async def test_old_items_are_not_loaded_or_matched(session):
+    source = Source(name="tg", source_type="telegram", url="@demo")
+    session.add(source)
+    await session.flush()
+    old = Item(
+        source_id=source.id,
+        title="Курсы валют",
+        text=_ORIGINAL,
+        content_hash="old",
+        lang="ru",
+        is_job=False,
+        simhash=compute_simhash(_ORIGINAL),
+        published_at=datetime.now(timezone.utc) - timedelta(days=3),
+    )
+    session.add(old)
+    await session.commit()
+
+    fresh = [
+        Item(
+            source_id=source.id,
+            title="Курсы валют",
+            text=text,
+            content_hash=f"fresh-{index}",
+            lang="ru",
+            is_job=False,
+            simhash=compute_simhash(text),
+            published_at=published_at,
+        )
+        for index, (text, published_at) in enumerate(
+            [
+                (_REPOST, datetime.now(timezone.utc) - timedelta(days=2)),
+                (_ORIGINAL, datetime.now(timezone.utc)),
+            ]
+        )
+    ]
+    session.add_all(fresh)
+    await session.flush()
+    await assign_clusters(session, fresh)
+
+    assert len(near_duplicate_index) == 0
+    assert [item.cluster_id for item in fresh] == [None, None]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.models.item import Item, ItemTopic
+from app.models.source import Source
+from app.models.topic import Topic
+from app.services import pipeline
+from app.services.ingestion import compute_content_hash
+from app.services.pipeline import ProcessingPipeline
+
+
+async def _seed(session_factory) -> int:
+    async with session_factory() as session:
+        source = Source(name="rss", source_type="rss", url="http://example.com/rss")
+        topic = Topic(name="Tech", keywords=["ai"])
+        session.add_all([source, topic])
+        await session.flush()
+        item = Item(
+            source_id=source.id,
+            title="AI news",
+            text="AI is everywhere.",
+            url="http://example.com/1",
+            content_hash=compute_content_hash("AI news", "http://example.com/1", "AI is everywhere."),
+            lang="en",
+            is_job=False,
+            pipeline_stage=pipeline.PIPELINE_ENTRY_STAGE,
+        )
+        session.add(item)
+        await session.commit()
+        return item.id
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_item_through_all_stages(session_factory, monkeypatch):
+    monkeypatch.setattr(pipeline.settings, "pipeline_poll_seconds", 0.05)
+    item_id = await _seed(session_factory)
+    stop_event = asyncio.Event()
+    task = asyncio.create_task(ProcessingPipeline(session_factory).run(stop_event))
+
+    for _ in range(200):
+        async with session_factory() as session:
+            item = await session.get(Item, item_id)
+            if item.pipeline_stage is None:
+                break
+        await asyncio.sleep(0.02)
+    stop_event.set()
+    await task
+
+    async with session_factory() as session:
+        item = await session.get(Item, item_id)
+        topics = (
+            await session.execute(select(ItemTopic).where(ItemTopic.item_id == item_id))
+        ).scalars().all()
+    assert item.pipeline_stage is None
+    assert item.trust_status is not None
+    assert len(topics) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_does_not_block_item(session_factory, monkeypatch):
+    item_id = await _seed(session_factory)
+
+    async def broken_tag(session, item):
+        raise RuntimeError("tagging unavailable")
+
+    monkeypatch.setitem(pipeline._HANDLERS, "tag", broken_tag)
+    await ProcessingPipeline(session_factory).process("tag", item_id)
+
+    async with session_factory() as session:
+        item = await session.get(Item, item_id)
+    assert item.pipeline_stage == "verify"
+
+
+@pytest.mark.asyncio
+async def test_verify_releases_connection_during_external_checks(session_factory, monkeypatch):
+    item_id = await _seed(session_factory)
+    pool = session_factory.kw["bind"].pool
+    checked_out: list[int] = []
+    original = pipeline.apply_sentinel
+
+    async def tracking_sentinel(item, source, reputation=None):
+        checked_out.append(pool.checkedout())
+        return await original(item, source, reputation)
+
+    monkeypatch.setattr(pipeline, "apply_sentinel", tracking_sentinel)
+    runner = ProcessingPipeline(session_factory)
+    await runner.process("tag", item_id)
+    await runner.process("verify", item_id)
+
+    async with session_factory() as session:
+        item = await session.get(Item, item_id)
+    assert checked_out == [0]
+    assert item.pipeline_stage == "deliver"
+    assert item.trust_status is not None
+
+
+@pytest.mark.asyncio
+async def test_duplicate_waits_for_canonical_verification(session_factory):
+    canonical_id = await _seed(session_factory)
+    async with session_factory() as session:
+        canonical = await session.get(Item, canonical_id)
+        duplicate = Item(
+            source_id=canonical.source_id,
+            title="AI news",
+            text="AI is everywhere!",
+            content_hash="duplicate",
+            lang="en",
+            is_job=False,
+            cluster_id=canonical_id,
+            pipeline_stage=pipeline.PIPELINE_ENTRY_STAGE,
+        )
+        session.add(duplicate)
+        await session.commit()
+        duplicate_id = duplicate.id
+
+    runner = ProcessingPipeline(session_factory)
+    assert await runner._pending_ids("tag") == [canonical_id]
+    await runner.process("tag", duplicate_id)
+    async with session_factory() as session:
+        assert (await session.get(Item, duplicate_id)).pipeline_stage == "tag"
+
+    await runner.process("tag", canonical_id)
+    await runner.process("verify", canonical_id)
+    assert await runner._pending_ids("tag") == [duplicate_id]
+    await runner.process("tag", duplicate_id)
+    async with session_factory() as session:
+        canonical = await session.get(Item, canonical_id)
+        duplicate = await session.get(Item, duplicate_id)
+    assert duplicate.pipeline_stage is None
+    assert duplicate.trust_status == canonical.trust_status is not None
+
+
+@pytest.mark.asyncio
+async def test_deliver_skips_deepdive_stage_when_precompute_is_idle(session_factory, monkeypatch):
+    monkeypatch.setitem(pipeline._HANDLERS, "deliver", lambda session, item: asyncio.sleep(0))
+    item_id = await _seed(session_factory)
+    async with session_factory() as session:
+        item = await session.get(Item, item_id)
+        item.pipeline_stage = "deliver"
+        item.impact = "high"
+        await session.commit()
+
+    runner = ProcessingPipeline(session_factory)
+    monkeypatch.setattr(pipeline.settings, "deepdive_precompute_enabled", False)
+    await runner.process("deliver", item_id)
+    async with session_factory() as session:
+        item = await session.get(Item, item_id)
+        assert item.pipeline_stage is None
+        item.pipeline_stage = "deliver"
+        await session.commit()
+
+    monkeypatch.setattr(pipeline.settings, "deepdive_precompute_enabled", True)
+    await runner.process("deliver", item_id)
+    async with session_factory() as session:
+        assert (await session.get(Item, item_id)).pipeline_stage == "deepdive"
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.item import Item
+from app.models.source import Source
+from app.models.source_reputation import SourceReputation
+from app.services import cross_check, reverify
+from app.services.reverify import reverify_errored_items
+from app.services.sentinel import apply_sentinel
+from app.services.websearch import WebSearchError
+
+
+@pytest.mark.asyncio
+async def _errored_items(session, monkeypatch, *texts: str, trust_manual: int = 70) -> list[Item]:
+    async def failing_search(query):
+        raise WebSearchError("Поиск временно недоступен.")
+
+    monkeypatch.setattr("app.services.sentinel.cross_check_coordinator.search", failing_search)
+    source = Source(
+        name="rss", source_type="rss", url="http://example.com/rss", trust_manual=trust_manual
+    )
+    session.add(source)
+    await session.flush()
+    items = [
+        Item(source_id=source.id, title=title, text=text, content_hash=title, lang="ru", is_job=False)
+        for title, text in texts
+    ]
+    session.add_all(items)
+    await session.flush()
+    for item in items:
+        await apply_sentinel(item, source)
+        assert item.sentinel_json["cross_check"]["status"] == "error"
+        item.reverify_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await session.commit()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_reverify_backs_off_while_search_keeps_failing(session, monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 6000)
+    monkeypatch.setattr(reverify.settings, "sentinel_reverify_max_attempts", 2)
+    low, high = await _errored_items(
+        session, monkeypatch, ("Заметка", "коротко"), ("Запуск", "подробности " * 100)
+    )
+
+    assert await reverify_errored_items(session) == 1
+    await session.commit()
+    await session.refresh(high)
+    await session.refresh(low)
+    assert high.sentinel_json["cross_check"]["attempts"] == 1
+    assert high.reverify_at is not None
+    assert "attempts" not in low.sentinel_json["cross_check"]
+
+    high.reverify_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await session.commit()
+    assert await reverify_errored_items(session) == 1
+    await session.commit()
+    await session.refresh(high)
+    assert high.sentinel_json["cross_check"]["attempts"] == 2
+    assert high.reverify_at is None
+
+
+@pytest.mark.asyncio
+async def test_reverify_records_cross_check_for_hype_items(session, monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 6000)
+    (item,) = await _errored_items(
+        session, monkeypatch, ("Сенсация", "шок подробности"), trust_manual=60
+    )
+    assert item.sentinel_json["logic_audit"]["status"] == "warning"
+
+    async def working_search(query):
+        return [{"title": "Подтверждение", "url": "http://example.com/other"}]
+
+    monkeypatch.setattr("app.services.sentinel.cross_check_coordinator.search", working_search)
+    assert await reverify_errored_items(session) == 1
+    await session.commit()
+
+    row = await session.get(SourceReputation, item.source_id)
+    assert (row.checked, row.searched, row.corroborated, row.hype) == (0, 1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_reverify_retries_errored_cross_checks(session, monkeypatch):
+    monkeypatch.setattr(cross_check.settings, "global_rate_limit_per_minute", 6000)
+    queries: list[str] = []
+
+    async def failing_search(query):
+        raise WebSearchError("Поиск временно недоступен.")
+
+    monkeypatch.setattr("app.services.sentinel.cross_check_coordinator.search", failing_search)
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss", trust_manual=70)
+    session.add(source)
+    await session.flush()
+    low = Item(source_id=source.id, title="Заметка", text="коротко", content_hash="a", lang="ru", is_job=False)
+    high = Item(
+        source_id=source.id,
+        title="Запуск",
+        text="подробности " * 100,
+        content_hash="b",
+        lang="ru",
+        is_job=False,
+    )
+    session.add_all([low, high])
+    await session.flush()
+    for item in (low, high):
+        await apply_sentinel(item, source)
+        assert item.sentinel_json["cross_check"]["status"] == "error"
+        assert item.reverify_at is not None
+        item.reverify_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    assert high.impact == "high"
+    duplicate = Item(
+        source_id=source.id,
+        title="Запуск",
+        text="подробности " * 100,
+        content_hash="c",
+        lang="ru",
+        is_job=False,
+        cluster_id=high.id,
+        trust_status=high.trust_status,
+    )
+    session.add(duplicate)
+    await session.commit()
+
+    async def working_search(query):
+        queries.append(query)
+        return [{"title": "Подтверждение", "url": "http://example.com/other"}]
+
+    monkeypatch.setattr("app.services.sentinel.cross_check_coordinator.search", working_search)
+    assert await reverify_errored_items(session) == 2
+    await session.commit()
+
+    assert queries == ["Запуск", "Заметка"]
+    for item in (low, high):
+        await session.refresh(item)
+        assert item.reverify_at is None
+        assert item.sentinel_json["cross_check"]["status"] == "ok"
+        assert item.sentinel_json["cross_check"]["attempts"] == 1
+        assert item.trust_status == "confirmed"
+    await session.refresh(duplicate)
+    assert duplicate.trust_status == "confirmed"
+    assert await reverify_errored_items(session) == 0
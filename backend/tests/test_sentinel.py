@@ -39,3 +39,44 @@ async def test_sentinel_populates_fields(session):
     assert artifacts.get("logic_audit") is not None
     assert artifacts.get("entity_verify") is not None
     assert artifacts.get("trust_ledger") is not None
+
+
+def _item(source: Source, title: str, text: str) -> Item:
+    return Item(
+        source_id=source.id,
+        title=title,
+        text=text,
+        content_hash=compute_content_hash(title, None, text),
+        lang="ru",
+        is_job=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sentinel_skips_cross_check_when_local_signals_decide(session, monkeypatch):
+    searches: list[str] = []
+
+    async def fake_search(query):
+        searches.append(query)
+        return [{"title": "Подтверждение", "url": "http://example.com/other"}]
+
+    monkeypatch.setattr("app.services.sentinel.cross_check_coordinator.search", fake_search)
+    trusted = Source(name="trusted", source_type="rss", url="http://example.com/a", trust_manual=95)
+    shaky = Source(name="shaky", source_type="rss", url="http://example.com/b", trust_manual=10)
+    middle = Source(name="middle", source_type="rss", url="http://example.com/c", trust_manual=70)
+    session.add_all([trusted, shaky, middle])
+    await session.flush()
+
+    confirmed = await apply_sentinel(_item(trusted, "Отчёт", "Выручка выросла"), trusted)
+    assert confirmed["cross_check"]["reason"] == "not_decisive"
+    assert confirmed["decided_by"] == "local"
+
+    hype = await apply_sentinel(_item(shaky, "Революция", "Шок! Прорыв"), shaky)
+    assert hype["cross_check"]["status"] == "skipped"
+    assert hype["trust_ledger"]["trust_status"] == "hype"
+    assert not searches
+
+    checked = await apply_sentinel(_item(middle, "Сделка", "Компания закрыла сделку"), middle)
+    assert checked["cross_check"]["status"] == "ok"
+    assert checked["decided_by"] == "web"
+    assert len(searches) == 1
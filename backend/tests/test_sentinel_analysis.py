@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import re
+
+import pytest
+
+from app.core.process_pool import get_process_pool, shutdown_process_pool
+from app.services import sentinel_analysis
+from app.services.sentinel_analysis import (
+    HYPE_MARKERS,
+    IMPACT_MARKERS,
+    SentinelAnalyzer,
+    analyze_batch,
+    analyze_text,
+)
+
+_TEXTS = [
+    "ШОК: Газпром и Сбербанк обсуждают поглощение на миллиард",
+    "Шок-контент: слух о санкциях против X-Corp и abc-Defg",
+    "Breaking news from OpenAI: IPO expected, not a сенсация-2",
+    "обычная новость без маркеров",
+    "Ёжик, Ab, АБВ- и Apple_Inc были упомянуты",
+]
+
+
+def _reference(text: str) -> tuple[list[str], bool, list[str]]:
+    lowered = text.lower()
+    hype = re.compile(r"\b(" + "|".join(map(re.escape, HYPE_MARKERS)) + r")\b")
+    impact = re.compile(r"\b(" + "|".join(map(re.escape, IMPACT_MARKERS)) + r")\b")
+    entities = sorted(set(re.findall(r"\b[А-ЯA-Z][\w-]{2,}\b", text)))[:10]
+    return sorted(set(hype.findall(lowered))), bool(impact.search(lowered)), entities
+
+
+@pytest.mark.parametrize("text", _TEXTS)
+def test_single_pass_matches_regex_analysis(text):
+    analysis = analyze_text(text)
+    hype, has_impact, entities = _reference(text)
+    assert list(analysis.hype_flags) == hype
+    assert analysis.has_impact_marker is has_impact
+    assert list(analysis.entities) == entities
+    assert analysis.text_length == len(text)
+
+
+@pytest.mark.asyncio
+async def test_large_batches_run_in_process_pool(monkeypatch):
+    monkeypatch.setattr(sentinel_analysis.settings, "sentinel_process_threshold_chars", 1)
+    try:
+        results = await analyze_batch(_TEXTS)
+        assert get_process_pool()._mp_context.get_start_method() == "forkserver"
+    finally:
+        shutdown_process_pool()
+    assert results == [analyze_text(text) for text in _TEXTS]
+
+
+@pytest.mark.asyncio
+async def test_analyzer_falls_back_inline_and_logs_pool_failures(monkeypatch, caplog):
+    async def broken_batch(texts):
+        raise RuntimeError("pool is gone")
+
+    monkeypatch.setattr(sentinel_analysis, "analyze_batch", broken_batch)
+    analyzer = SentinelAnalyzer()
+    results = await asyncio.gather(*(analyzer.analyze(text) for text in _TEXTS[:2]))
+
+    assert results == [analyze_text(text) for text in _TEXTS[:2]]
+    assert "pool is gone" in caplog.text
@@ -43,3 +43,14 @@ def test_validate_settings_rejects_bad_admin_config(monkeypatch, env_name, env_v
     with pytest.raises(ValueError):
         validate_settings(settings)
     get_settings.cache_clear()
+
+
+def test_validate_settings_rejects_ingestion_workers_above_pool(monkeypatch):
+    monkeypatch.setenv("INGESTION_MAX_WORKERS", "40")
+    monkeypatch.setenv("DB_POOL_SIZE", "5")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "10")
+    get_settings.cache_clear()
+    settings = get_settings()
+    with pytest.raises(ValueError):
+        validate_settings(settings)
+    get_settings.cache_clear()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.item import Item
+from app.models.source import Source
+from app.models.source_reputation import SourceReputation
+from app.services import source_reputation as reputation_module
+from app.services.sentinel import apply_sentinel
+from app.services.source_reputation import ReputationStats, SourceReputationLedger
+
+_CORROBORATED = {"cross_check": {"status": "ok"}, "logic_audit": {"status": "ok"}}
+_HYPE = {"cross_check": {"status": "missing"}, "logic_audit": {"status": "warning"}}
+
+
+@pytest.mark.asyncio
+async def test_reputation_tracks_outcomes_and_feedback(session):
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss", trust_manual=70)
+    session.add(source)
+    await session.flush()
+    ledger = SourceReputationLedger()
+
+    baseline = await ledger.get(session, source)
+    assert baseline.score == 70
+    for _ in range(21):
+        await ledger.record_outcome(session, source.id, _CORROBORATED)
+    await ledger.record_feedback(session, source.id, None, "like")
+    await session.commit()
+    good = await ledger.get(session, source)
+    assert good.score > 85
+    assert good.trusted
+
+    await ledger.record_feedback(session, source.id, "like", "dislike")
+    for _ in range(20):
+        await ledger.record_outcome(session, source.id, _HYPE)
+    await session.commit()
+    bad = await ledger.get(session, source)
+    assert bad.score < good.score
+
+    row = await session.get(SourceReputation, source.id)
+    assert row.checked == pytest.approx(41, rel=1e-3)
+    assert row.searched == pytest.approx(41, rel=1e-3)
+    assert row.likes == pytest.approx(0, abs=1e-3)
+    assert row.dislikes == pytest.approx(1, rel=1e-3)
+
+    reloaded = await SourceReputationLedger().get(session, source)
+    assert reloaded.score == bad.score
+
+
+@pytest.mark.asyncio
+async def test_corroboration_rate_ignores_unsearched_items(session):
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss", trust_manual=70)
+    session.add(source)
+    await session.flush()
+    ledger = SourceReputationLedger()
+    for _ in range(10):
+        await ledger.record_outcome(session, source.id, _CORROBORATED)
+    await session.commit()
+    searched_only = await ledger.get(session, source)
+
+    skipped = {"cross_check": {"status": "skipped"}, "logic_audit": {"status": "ok"}}
+    for _ in range(30):
+        await ledger.record_outcome(session, source.id, skipped)
+    await ledger.record_outcome(session, source.id, {"cross_check": {"status": "ok"}}, reverified=True)
+    await session.commit()
+    reputation = await ledger.get(session, source)
+
+    row = await session.get(SourceReputation, source.id)
+    assert row.checked == pytest.approx(40, rel=1e-3)
+    assert row.searched == pytest.approx(11, rel=1e-3)
+    assert row.corroborated == pytest.approx(11, rel=1e-3)
+    assert reputation.checked == pytest.approx(40, rel=1e-3)
+    assert reputation.score >= searched_only.score
+
+
+@pytest.mark.asyncio
+async def test_reputation_cache_changes_only_after_commit(session_factory):
+    async with session_factory() as session:
+        source = Source(name="rss", source_type="rss", url="http://example.com/rss", trust_manual=70)
+        session.add(source)
+        await session.commit()
+    ledger = SourceReputationLedger()
+
+    async with session_factory() as session:
+        assert (await ledger.get(session, source)).checked == 0
+        await ledger.record_outcome(session, source.id, _CORROBORATED)
+        assert (await ledger.get(session, source)).checked == 0
+        await session.rollback()
+    async with session_factory() as session:
+        assert (await ledger.get(session, source)).checked == 0
+
+    async with session_factory() as first, session_factory() as second:
+        await ledger.record_outcome(first, source.id, _CORROBORATED)
+        await first.commit()
+        await ledger.record_outcome(second, source.id, _HYPE)
+        await second.commit()
+    async with session_factory() as session:
+        reputation = await ledger.get(session, source)
+        row = await session.get(SourceReputation, source.id)
+    assert reputation.checked == pytest.approx(2, rel=1e-3)
+    assert (row.searched, row.corroborated, row.hype) == pytest.approx((2, 1, 1), rel=1e-3)
+
+
+def test_reputation_decays_with_half_life(monkeypatch):
+    monkeypatch.setattr(reputation_module.settings, "source_reputation_half_life_days", 10)
+    now = datetime.now(timezone.utc).timestamp()
+    stats = ReputationStats(checked=8, corroborated=8, updated_at=now - timedelta(days=10).total_seconds())
+    decayed = stats.decayed(now)
+    assert decayed.checked == pytest.approx(4)
+    assert decayed.corroborated == pytest.approx(4)
+
+
+@pytest.mark.asyncio
+async def test_trusted_source_skips_cross_check(session, monkeypatch):
+    source = Source(name="rss", source_type="rss", url="http://example.com/rss", trust_manual=90)
+    session.add(source)
+    await session.flush()
+    ledger = SourceReputationLedger()
+    for _ in range(25):
+        await ledger.record_outcome(session, source.id, _CORROBORATED)
+    await session.commit()
+    reputation = await ledger.get(session, source)
+
+    async def unexpected_search(query):
+        raise AssertionError("cross-check should be skipped")
+
+    monkeypatch.setattr("app.services.sentinel.cross_check_coordinator.search", unexpected_search)
+    item = Item(
+        source_id=source.id,
+        title="Новость",
+        text="Короткий текст",
+        content_hash="hash",
+        lang="ru",
+        is_job=False,
+    )
+    artifacts = await apply_sentinel(item, source, reputation)
+
+    assert artifacts["cross_check"]["status"] == "skipped"
+    assert artifacts["trust_ledger"]["source_reputation"] == reputation.score
+    assert item.trust_score == min(100, reputation.score + 5)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import chromadb
+import pytest
+
+from app.services import chroma, topic_vectors
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.topic_catalog import CatalogTopic, TopicSnapshot
+from app.services.topic_vectors import TopicVectorIndex
+
+_VOCABULARY = ["bank", "loan", "credit", "ai", "model", "robot", "football", "match"]
+
+
+def _snapshot(*topics: CatalogTopic) -> TopicSnapshot:
+    return TopicSnapshot(
+        version=(len(topics), max(topic.id for topic in topics), None),
+        topics=topics,
+        matcher=KeywordMatcher({}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_vector_index_matches_nearest_topic(monkeypatch, bag_of_words):
+    monkeypatch.setattr(topic_vectors.settings, "topic_vector_min_similarity", 0.5)
+    client = chromadb.EphemeralClient()
+    try:
+        client.delete_collection(chroma._collection_name("topics"))
+    except Exception:
+        pass
+    index = TopicVectorIndex(client=client, embedding_function=bag_of_words(_VOCABULARY))
+    finance = CatalogTopic(id=1, name="Finance", description="bank loan credit", keywords=(), order=None)
+    tech = CatalogTopic(id=2, name="Tech", description="ai model robot", keywords=(), order=None)
+
+    matches = await index.match(_snapshot(finance, tech), "New AI model", "robot ai", 3)
+    assert [topic_id for topic_id, _ in matches] == [2]
+
+    sport = CatalogTopic(id=3, name="Sport", description="football match", keywords=(), order=None)
+    matches = await index.match(_snapshot(finance, sport), "Football", "match report", 3)
+    assert [topic_id for topic_id, _ in matches] == [3]
+    assert await index.match(_snapshot(finance, sport), "ai", "model robot", 3) == []
+
+
+def test_collections_are_scoped_to_embedding_model(monkeypatch):
+    monkeypatch.setattr(chroma.settings, "embedding_model", "intfloat/multilingual-e5-small")
+    assert chroma._collection_name("topics") == "topics_multilingual-e5-small"
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from app.services import websearch
@@ -24,3 +26,82 @@ async def test_websearch_cache_eviction(monkeypatch):
 
     assert len(client._cache) == 2
     assert "first" not in client._cache
+
+
+@pytest.mark.asyncio
+async def test_websearch_single_flight_and_parallel_fetches(monkeypatch):
+    client = WebSearchClient()
+    monkeypatch.setattr(websearch.settings, "global_rate_limit_per_minute", 100)
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def slow_fetch(query: str):
+        started.append(query)
+        await release.wait()
+        return [{"title": query, "url": f"http://example.com/{query}"}]
+
+    monkeypatch.setattr(client, "_fetch", slow_fetch)
+
+    searches = [
+        asyncio.create_task(client.search("same")),
+        asyncio.create_task(client.search("same")),
+        asyncio.create_task(client.search("other")),
+    ]
+    await asyncio.sleep(0.01)
+    assert sorted(started) == ["other", "same"]
+
+    release.set()
+    first, second, other = await asyncio.gather(*searches)
+    assert first is second
+    assert other[0]["title"] == "other"
+    assert await client.search("same") is first
+    assert len(started) == 2
+
+
+@pytest.mark.asyncio
+async def test_websearch_cache_is_lru_and_persistent(session_factory, monkeypatch):
+    monkeypatch.setattr(websearch.settings, "openserp_url", "http://openserp")
+    monkeypatch.setattr(websearch.settings, "web_search_cache_max_entries", 2)
+    monkeypatch.setattr(websearch.settings, "global_rate_limit_per_minute", 100)
+    fetched: list[str] = []
+
+    async def fake_fetch(query: str):
+        fetched.append(query)
+        return [{"title": query, "url": f"http://example.com/{query}"}]
+
+    client = WebSearchClient(session_factory)
+    monkeypatch.setattr(client, "_fetch", fake_fetch)
+    await client.search("first")
+    await client.search("second")
+    await client.search("first")
+    await client.search("third")
+    assert list(client._cache) == ["first", "third"]
+
+    restarted = WebSearchClient(session_factory)
+    monkeypatch.setattr(restarted, "_fetch", fake_fetch)
+    assert (await restarted.search("second"))[0]["title"] == "second"
+    assert fetched == ["first", "second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_checked_search_reads_persistent_cache_once(session_factory, monkeypatch):
+    monkeypatch.setattr(websearch.settings, "openserp_url", "http://openserp")
+    monkeypatch.setattr(websearch.settings, "global_rate_limit_per_minute", 100)
+    client = WebSearchClient(session_factory)
+    loads: list[str] = []
+    load_persistent = client._load_persistent
+
+    async def counting_load(query: str):
+        loads.append(query)
+        return await load_persistent(query)
+
+    async def fake_fetch(query: str):
+        return [{"title": query, "url": f"http://example.com/{query}"}]
+
+    monkeypatch.setattr(client, "_load_persistent", counting_load)
+    monkeypatch.setattr(client, "_fetch", fake_fetch)
+    assert await client.cached("query") is None
+    await client.search("query", cache_checked=True)
+
+    assert loads == ["query"]
+    assert await WebSearchClient(session_factory).cached("query") == await fake_fetch("query")